@@ -2,6 +2,10 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 import time
 import os
 
+from metrics import timed
+from tracing import traced
+from gesture_events import CURSOR_MOVED, PINCH_START, PINCH_END
+
 class DrawingBoard(QtWidgets.QWidget):
     """
     改进的画板：
@@ -9,6 +13,8 @@ class DrawingBoard(QtWidgets.QWidget):
     - 使用捏合手势作为落笔动作
     - 画笔光标始终显示在最上层
     - 支持贴图功能
+    - connect_events(bus) 后由手势事件驱动：只在光标移动或捏合状态变化时更新和重绘
+    - set_frame_context(ctx) 接收主窗口每帧的 FrameContext
     """
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -39,6 +45,8 @@ class DrawingBoard(QtWidgets.QWidget):
         # 光标设置（始终显示在最上层）
         self.cursor_pos = None
         self.cursor_visible = False
+        self.cursor_track = None  # 光标所跟随的手的 track_id
+        self.frame_context = None  # 最近一帧的 FrameContext
         
         # 贴图功能
         self.stickers = []  # 存储已放置的贴图
@@ -69,6 +77,10 @@ class DrawingBoard(QtWidgets.QWidget):
         self.hover_start = None
         self.dwell_time = 0.8
         self.last_hover_tool = None
+        # 光标静止时没有事件，悬停计时到点后由定时器再检查一次
+        self.dwell_timer = QtCore.QTimer(self)
+        self.dwell_timer.setSingleShot(True)
+        self.dwell_timer.timeout.connect(self._on_dwell_timeout)
         
         # 绘制状态跟踪
         self.is_drawing = False
@@ -172,6 +184,8 @@ class DrawingBoard(QtWidgets.QWidget):
             self.image = new_img
         super().resizeEvent(event)
 
+    @timed('drawing.paint')
+    @traced('paint')
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
         
@@ -359,6 +373,10 @@ class DrawingBoard(QtWidgets.QWidget):
                 self.last_hover_tool = current_hover
                 self.hover_start = now
                 self.hover_tool = current_hover
+                if current_hover:
+                    self.dwell_timer.start(int(self.dwell_time * 1000) + 20)
+                else:
+                    self.dwell_timer.stop()
             
             # 检查是否触发工具
             if self.hover_tool and now - self.hover_start >= self.dwell_time:
@@ -449,6 +467,34 @@ class DrawingBoard(QtWidgets.QWidget):
         
         self.update()
 
+    def set_frame_context(self, ctx):
+        """接收主窗口每帧的 FrameContext"""
+        self.frame_context = ctx
+
+    # 手势事件
+    def connect_events(self, bus):
+        """订阅光标移动和捏合事件"""
+        bus.subscribe(CURSOR_MOVED, self._on_cursor_moved)
+        bus.subscribe(PINCH_START, self._on_pinch_changed)
+        bus.subscribe(PINCH_END, self._on_pinch_changed)
+
+    def _on_cursor_moved(self, event):
+        if event.track_id != self.cursor_track:
+            # 光标换到另一只手：不与上一只手的笔画相连
+            self.cursor_track = event.track_id
+            self.last_point = None
+            self.drag_start = None
+        self.update_cursor(event.pos, event.pinching)
+
+    def _on_pinch_changed(self, event):
+        # 只关心光标手的捏合（pos 为 None 的是另一只手）
+        if event.pos is not None:
+            self.update_cursor(event.pos, event.pinching)
+
+    def _on_dwell_timeout(self):
+        if self.cursor_pos is not None:
+            self.update_cursor(self.cursor_pos, self.is_drawing)
+
     def _activate_tool(self, tool_name):
         """激活选中的工具"""
         if tool_name == 'back':
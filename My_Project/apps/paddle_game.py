@@ -1,6 +1,9 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 import random
 
+from metrics import timed
+from tracing import traced
+
 class PaddleGame(QtWidgets.QWidget):
     """
     挡板球游戏（支持挡板XY双方向移动）：
@@ -9,6 +12,9 @@ class PaddleGame(QtWidgets.QWidget):
       - 多个球会反弹，若任一球落到底部则重置所有球
     接口：
       - update_cursor(pos): pos 为 (x,y) 或 None
+      - hand_source: 可选的回调，每个节拍调用一次，返回当前的 (x,y) 或 None；
+                     设置后挡板按游戏节拍跟随手部，而不是等待每次推理结果
+      - set_frame_context(ctx): 接收主窗口每帧的 FrameContext
     """
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -16,6 +22,8 @@ class PaddleGame(QtWidgets.QWidget):
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.game_step)
         self.timer.start(16)  # ~60fps
+        self.hand_source = None
+        self.frame_context = None  # 最近一帧的 FrameContext
 
         # 挡板设置（支持XY移动）
         self.paddle_w = 120
@@ -42,6 +50,8 @@ class PaddleGame(QtWidgets.QWidget):
         self.paddle_y = max(self.height() // 2, min(self.height() - self.paddle_h - 20, self.paddle_y))
         super().resizeEvent(event)
 
+    @timed('game.paint')
+    @traced('paint')
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
         painter.fillRect(self.rect(), QtGui.QColor('white'))
@@ -76,7 +86,16 @@ class PaddleGame(QtWidgets.QWidget):
 
         painter.end()
 
+    def set_frame_context(self, ctx):
+        """接收主窗口每帧的 FrameContext"""
+        self.frame_context = ctx
+
+    @timed('game.step')
+    @traced('game_step')
     def game_step(self):
+        if self.hand_source:
+            self.update_cursor(self.hand_source())
+
         # 更新所有球的位置
         for ball in self.balls:
             ball['x'] += ball['vx']
@@ -30,6 +30,8 @@ class PaddleVersus(QtWidgets.QWidget):
         # 手势位置存储（左手控制左挡板，右手控制右挡板）
         self.left_hand_pos = None  # 左手Y坐标
         self.right_hand_pos = None  # 右手Y坐标
+        # 可选的手部位置回调，每个节拍调用一次，返回 (左手位置, 右手位置)
+        self.hand_source = None
         
         # 游戏状态
         self.game_running = True
@@ -51,6 +53,8 @@ class PaddleVersus(QtWidgets.QWidget):
             return
             
         # 手势控制挡板移动
+        if self.hand_source:
+            self.update_hands(*self.hand_source())
         self._control_paddles()
         
         # 更新球位置
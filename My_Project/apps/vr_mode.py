@@ -2,6 +2,10 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 import numpy as np
 import math
+import time
+
+from metrics import timed
+from tracing import traced
 
 class VRMode(QtWidgets.QWidget):
     """VR模式：手势控制虚拟人物移动，虚拟世界与显示世界叠加"""
@@ -30,11 +34,15 @@ class VRMode(QtWidgets.QWidget):
         
         self.score = 0
         self.camera_frame = None  # 存储摄像头帧
+        self.frame_context = None  # 最近一帧的 FrameContext
         
         # 游戏定时器
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.game_step)
         self.timer.start(16)  # ~60fps
+        self.last_time = time.time()
+        # 可选的手部位置回调，每个节拍调用一次，返回 (x,y) 或 None
+        self.hand_source = None
 
     def generate_collectibles(self, count):
         """生成可收集物品"""
@@ -49,8 +57,19 @@ class VRMode(QtWidgets.QWidget):
                 "collected": False
             })
 
+    @timed('vr.step')
+    @traced('game_step')
     def game_step(self):
         """游戏逻辑更新"""
+        current_time = time.time()
+        delta_time = current_time - self.last_time
+        self.last_time = current_time
+
+        changed = False
+        if self.hand_source:
+            # player_speed 是按每个推理帧（约30fps）设定的步长，按节拍间隔折算，移动速度不随节拍变化
+            changed = self.update_hand_position(self.hand_source(), scale=min(delta_time * 30, 3.0))
+
         # 检查收集物品
         for item in self.collectibles:
             if not item["collected"]:
@@ -59,18 +78,27 @@ class VRMode(QtWidgets.QWidget):
                 if dist < (self.player_size + item["size"]):
                     item["collected"] = True
                     self.score += 10
+                    changed = True
         
-        # 重绘
-        self.update()
+        # 只在玩家或物品变化时重绘（摄像头新帧到达时另行重绘），没有手时不再每个节拍重绘
+        if changed:
+            self.update()
+
+    def set_frame_context(self, ctx):
+        """接收主窗口每帧的 FrameContext"""
+        self.frame_context = ctx
+        self.update_camera_frame(ctx.frame)
 
     def update_camera_frame(self, frame):
         """更新摄像头帧"""
         self.camera_frame = frame
+        self.update()
 
-    def update_hand_position(self, pos):
-        """根据手势位置更新玩家移动方向"""
+    def update_hand_position(self, pos, scale=1.0):
+        """根据手势位置更新玩家移动方向，scale 为本次移动步长的倍数；返回玩家方向或位置是否变化"""
         if pos is None:
-            return
+            return False
+        before = (self.player_direction, self.player_pos[0], self.player_pos[1])
             
         # 计算玩家方向（相对于屏幕中心）
         center_x, center_y = self.width()//2, self.height()//2
@@ -85,8 +113,8 @@ class VRMode(QtWidgets.QWidget):
         
         # 计算移动向量
         rad = math.radians(angle)
-        move_x = self.player_speed * math.cos(rad)
-        move_y = self.player_speed * math.sin(rad)
+        move_x = self.player_speed * scale * math.cos(rad)
+        move_y = self.player_speed * scale * math.sin(rad)
         
         # 更新玩家位置（边界检查）
         new_x = max(self.player_size, min(self.world_size[0]-self.player_size, self.player_pos[0] + move_x))
@@ -105,7 +133,10 @@ class VRMode(QtWidgets.QWidget):
         if not collision:
             self.player_pos[0] = new_x
             self.player_pos[1] = new_y
+        return (self.player_direction, self.player_pos[0], self.player_pos[1]) != before
 
+    @timed('vr.paint')
+    @traced('paint')
     def paintEvent(self, event):
         """绘制VR世界"""
         painter = QtGui.QPainter(self)
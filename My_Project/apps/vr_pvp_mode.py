@@ -3,6 +3,9 @@ import numpy as np
 import math
 import time
 
+from metrics import timed
+from tracing import traced
+
 class VRPVPMode(QtWidgets.QWidget):
     """VR PVP模式：修复屏幕中心退出按钮功能"""
     def __init__(self, parent=None):
@@ -41,6 +44,7 @@ class VRPVPMode(QtWidgets.QWidget):
         
         # 摄像头背景
         self.camera_background = None
+        self.frame_context = None  # 最近一帧的 FrameContext
         
         # 退出按钮设置（屏幕中间）
         self.exit_button = {
@@ -55,6 +59,8 @@ class VRPVPMode(QtWidgets.QWidget):
         # 手势位置跟踪
         self.left_hand_pos = None
         self.right_hand_pos = None
+        # 可选的手部位置回调，每个节拍调用一次，返回 (左手位置, 右手位置)
+        self.hand_source = None
         
         # 游戏定时器
         self.timer = QtCore.QTimer(self)
@@ -95,11 +101,18 @@ class VRPVPMode(QtWidgets.QWidget):
                 "collector": None
             })
 
+    @timed('vr_pvp.step')
+    @traced('game_step')
     def game_step(self):
         """游戏逻辑更新"""
         current_time = time.time()
         delta_time = current_time - self.last_time
         self.last_time = current_time
+
+        if self.hand_source:
+            # player_speed 是按每个推理帧（约30fps）设定的步长，按节拍间隔折算
+            pos1, pos2 = self.hand_source()
+            self.update_hand_positions(pos1, pos2, scale=min(delta_time * 30, 3.0))
         
         # 检查收集物
         for item in self.collectibles:
@@ -169,12 +182,17 @@ class VRPVPMode(QtWidgets.QWidget):
         else:
             print("错误：无法找到返回菜单的方法")
 
+    def set_frame_context(self, ctx):
+        """接收主窗口每帧的 FrameContext"""
+        self.frame_context = ctx
+        self.update_camera_background(ctx.frame)
+
     def update_camera_background(self, frame):
         """更新摄像头背景帧"""
         self.camera_background = frame
 
-    def update_hand_positions(self, pos1, pos2):
-        """更新手部位置（确保坐标正确）"""
+    def update_hand_positions(self, pos1, pos2, scale=1.0):
+        """更新手部位置（确保坐标正确），scale 为本次移动步长的倍数"""
         # 验证坐标有效性
         def validate_pos(pos):
             if pos is None:
@@ -190,13 +208,13 @@ class VRPVPMode(QtWidgets.QWidget):
         
         # 更新玩家位置
         if pos1 is not None:
-            self._update_player_position(1, pos1)
+            self._update_player_position(1, pos1, scale)
             
         if pos2 is not None:
-            self._update_player_position(2, pos2)
+            self._update_player_position(2, pos2, scale)
 
     # 其余方法保持不变...
-    def _update_player_position(self, player_id, pos):
+    def _update_player_position(self, player_id, pos, scale=1.0):
         if player_id == 1:
             player_pos = self.player1_pos
         else:
@@ -217,8 +235,8 @@ class VRPVPMode(QtWidgets.QWidget):
             self.player2_direction = angle
         
         rad = math.radians(angle)
-        move_x = self.player_speed * math.cos(rad)
-        move_y = self.player_speed * math.sin(rad)
+        move_x = self.player_speed * scale * math.cos(rad)
+        move_y = self.player_speed * scale * math.sin(rad)
         
         new_x = max(self.player_size, min(self.world_size[0]-self.player_size, player_pos[0] + move_x))
         new_y = max(self.player_size, min(self.world_size[1]-self.player_size, player_pos[1] + move_y))
@@ -243,6 +261,8 @@ class VRPVPMode(QtWidgets.QWidget):
                 self.player2_pos[0] = new_x
                 self.player2_pos[1] = new_y
 
+    @timed('vr_pvp.paint')
+    @traced('paint')
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
         
@@ -256,14 +276,8 @@ class VRPVPMode(QtWidgets.QWidget):
                 bytes_per_line, 
                 QtGui.QImage.Format_RGB888
             )
-            painter.drawImage(
-                self.rect(), 
-                q_img.scaled(
-                    self.size(), 
-                    QtCore.Qt.KeepAspectRatio, 
-                    QtCore.Qt.SmoothTransformation
-                )
-            )
+            # 直接缩放绘制到窗口区域，不再生成中间缩放图像
+            painter.drawImage(self.rect(), q_img)
         
         # 2. 绘制中间分割线
         painter.setPen(QtGui.QPen(QtGui.QColor(255, 0, 0, 200), 4))
@@ -0,0 +1,225 @@
+"""
+无界面端到端延迟测试：
+    QT_QPA_PLATFORM=offscreen python benchmark.py --source video:clip.mp4 --frames 300
+    QT_QPA_PLATFORM=offscreen python benchmark.py --replay hands.aclm --source synthetic --output run.json
+逐帧同步驱动真实的 MainWindow 流水线（不启动采集/流水线线程），
+按模式（menu / drawing / game / vr / vr_pvp）统计各阶段的 p50/p95/p99 延迟和吞吐量，
+结果以 JSON 输出，便于比较不同版本的测试结果。
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+from PyQt5 import QtWidgets
+
+from capture import FramePacket
+from frame_source import open_frame_source, add_source_arguments
+
+MODES = ['menu', 'drawing', 'game', 'vr', 'vr_pvp']
+
+
+class StageTimer:
+    """收集各阶段每次调用的耗时（毫秒）"""
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, name, func):
+        """返回计时版本的 func，每次调用的耗时记入 name 阶段"""
+        samples = self.samples[name]
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def add(self, name, ms):
+        self.samples[name].append(ms)
+
+    def summary(self, wall_time):
+        result = {}
+        for name, values in self.samples.items():
+            if not values:
+                continue
+            arr = np.asarray(values)
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+            result[name] = {
+                'count': len(values),
+                'mean_ms': round(float(arr.mean()), 3),
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(arr.max()), 3),
+                'throughput_fps': round(len(values) / wall_time, 2) if wall_time else 0.0,
+            }
+        return result
+
+
+def _enter_mode(win, mode):
+    starters = {
+        # 绕过实例上禁用的 _return_to_menu
+        'menu': lambda: type(win)._return_to_menu(win),
+        'drawing': win._start_drawing,
+        'game': win._start_game,
+        'vr': win._start_vr,
+        'vr_pvp': win._start_vr_pvp,
+    }
+    starters[mode]()
+
+
+def _instrument(win, timer):
+    """把计时器挂到各阶段的实例方法上（只影响这个窗口实例）"""
+    if win.tracker is not None:
+        win.tracker.process_rgb = timer.wrap('hand_tracker', win.tracker.process_rgb)
+    if win.recognizer_tracker is not None:
+        win.recognizer_tracker.recognize_rgb = timer.wrap('recognizer', win.recognizer_tracker.recognize_rgb)
+    win.glogic.get_hand_gesture = timer.wrap('gesture_logic', win.glogic.get_hand_gesture)
+    win._draw_hand_landmarks = timer.wrap('draw_landmarks', win._draw_hand_landmarks)
+    win.cam_label.set_frame = timer.wrap('qimage_convert', win.cam_label.set_frame)
+
+
+def run_mode(win, source, mode, frames, warmup):
+    """在指定模式下处理 frames 帧，返回该模式的统计结果"""
+    _enter_mode(win, mode)
+    app = QtWidgets.QApplication.instance()
+    app.processEvents()
+
+    timer = StageTimer()
+    seq = win._last_seq
+    processed = 0
+    start_wall = None
+
+    while processed < frames + warmup:
+        if processed == warmup:
+            # 预热结束，重新挂计时器，只统计正式测试部分
+            timer = StageTimer()
+            _instrument(win, timer)
+            start_wall = time.perf_counter()
+
+        t0 = time.perf_counter()
+        ok, raw = source.read()
+        if not ok:
+            if source.exhausted:
+                print(f"[benchmark] 帧来源已读完，{mode} 模式只测试了 {max(0, processed - warmup)} 帧")
+                break
+            continue
+        t1 = time.perf_counter()
+        seq += 1
+        packet = FramePacket(win.capture._to_rgb(raw), time.monotonic(), seq, win.frame_pool)
+        t2 = time.perf_counter()
+        packet = win._stage_inference(packet)
+        t3 = time.perf_counter()
+        packet = win._stage_gesture(packet)
+        t4 = time.perf_counter()
+        # publish 在同一线程中通过直连信号同步执行 _update（界面处理）
+        win.publisher.publish(packet)
+        t5 = time.perf_counter()
+        # 同步重绘当前界面，测量 paintEvent
+        win.stack.currentWidget().repaint()
+        t6 = time.perf_counter()
+        app.processEvents()
+
+        if processed >= warmup:
+            timer.add('source_read', (t1 - t0) * 1000)
+            timer.add('capture_convert', (t2 - t1) * 1000)
+            timer.add('stage_inference', (t3 - t2) * 1000)
+            timer.add('stage_gesture', (t4 - t3) * 1000)
+            timer.add('render', (t5 - t4) * 1000)
+            timer.add('paint', (t6 - t5) * 1000)
+            timer.add('frame_total', (t6 - t0) * 1000)
+        processed += 1
+
+    wall = time.perf_counter() - start_wall if start_wall else 0.0
+    _uninstrument(win)
+    return {
+        'frames': max(0, processed - warmup),
+        'wall_time_s': round(wall, 3),
+        'stages': timer.summary(wall),
+    }
+
+
+def _uninstrument(win):
+    """去掉实例上的计时包装，恢复类方法"""
+    for obj, names in ((win.tracker, ['process_rgb']),
+                       (win.recognizer_tracker, ['recognize_rgb']),
+                       (win.glogic, ['get_hand_gesture']),
+                       (win, ['_draw_hand_landmarks']),
+                       (win.cam_label, ['set_frame'])):
+        if obj is None:
+            continue
+        for name in names:
+            obj.__dict__.pop(name, None)
+
+
+def main(argv=None):
+    parser = add_source_arguments(argparse.ArgumentParser(description="AirCtrl 无界面延迟测试"))
+    parser.set_defaults(source='synthetic')
+    parser.add_argument('--replay', metavar='PATH', help='用录制的关键点文件代替 MediaPipe 推理')
+    parser.add_argument('--modes', default=','.join(MODES), help='要测试的模式，逗号分隔（默认全部）')
+    parser.add_argument('--frames', type=int, default=300, help='每个模式测试的帧数（默认 300）')
+    parser.add_argument('--warmup', type=int, default=30, help='每个模式的预热帧数（默认 30）')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--output', metavar='PATH', help='JSON 结果输出文件（默认打印到标准输出）')
+    args = parser.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"未知模式: {mode}")
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # 只需保持 QApplication 存活，run_mode 通过 QApplication.instance() 使用它
+    _app = QtWidgets.QApplication(sys.argv[:1])
+
+    # 导入放在 QApplication 创建之后，main 模块依赖 MediaPipe
+    from main import MainWindow
+
+    # 逐帧同步测试不使用质量调节，保证各次结果可比
+    win = MainWindow(source=args.source, realtime=False, replay_path=args.replay,
+                     replay_speed=0, latency_budget_ms=None, autostart=False,
+                     watchdog_ms=None)
+    # 测试期间不允许手势切换界面
+    win._return_to_menu = lambda: None
+    win._trigger_button = lambda name: None
+
+    # 测试总是尽可能快地读取帧，不按来源帧率节拍
+    source = open_frame_source(args.source, realtime=False,
+                               width=args.width, height=args.height)
+    results = {
+        'source': args.source,
+        'replay': args.replay,
+        'frame_size': [source.width, source.height],
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'modes': {},
+    }
+    try:
+        for mode in modes:
+            results['modes'][mode] = run_mode(win, source, mode, args.frames, args.warmup)
+            print(f"[benchmark] {mode}: "
+                  f"{results['modes'][mode]['stages'].get('frame_total', {}).get('p50_ms', '-')}ms p50")
+    finally:
+        source.release()
+        win.close()
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"[benchmark] 结果已写入 {args.output}")
+    else:
+        print(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import time
+import threading
+
+import cv2
+from PyQt5 import QtCore
+
+from frame_source import FrameSource, open_frame_source
+from tracing import TRACER
+
+
+class FramePacket:
+    """
+    一帧采集结果
+    frame: RGB 图像（已做镜像翻转）。每帧只转换一次，整条流水线（推理、官方模型、
+           标注、界面显示、各应用）共享同一缓冲区，不再各自复制和转换
+    timestamp: 采集时间戳（秒，time.monotonic 时钟）
+    seq: 递增的帧序号，从 1 开始
+    其余字段由流水线各阶段依次填充：
+    hands: HandTracker 输出的手部列表
+    gestures: GestureLogic 识别出的 (x, y, gesture) 列表（帧坐标）
+    official_gestures: 官方模型识别出的 (x, y, gesture) 列表（帧坐标）
+    tracks: 与 hands 一一对应的 HandTrack（跨帧跟踪状态）
+    hand_gestures: 与 hands 一一对应的稳定手势名，只在主菜单下识别，其他时候为 None
+    skipped: 质量调节跳过推理的帧；其 hands 等结果沿用上一帧，不是新的观测
+    pool: frame 所属的 FramePool；帧不再使用时调用 release() 归还缓冲区
+    """
+    __slots__ = ('frame', 'timestamp', 'seq', 'hands', 'gestures', 'official_gestures', 'tracks', 'hand_gestures', 'skipped', 'pool')
+
+    def __init__(self, frame, timestamp, seq, pool=None):
+        self.frame = frame
+        self.timestamp = timestamp
+        self.seq = seq
+        self.hands = []
+        self.gestures = []
+        self.official_gestures = []
+        self.tracks = []
+        self.hand_gestures = None
+        self.skipped = False
+        self.pool = pool
+
+    def release(self):
+        """把帧缓冲区归还给缓冲池（只归还一次），之后不得再访问 frame"""
+        if self.pool is not None and self.frame is not None:
+            self.pool.release(self.frame)
+        self.frame = None
+        self.pool = None
+
+
+class CaptureThread(QtCore.QThread):
+    """
+    独立的采集线程：
+      - 在线程内部打开并持有帧来源（FrameSource：摄像头、视频文件、图片目录或合成画面），
+        重连等耗时操作不会阻塞 GUI
+      - 只保留最新一帧（latest-frame slot），旧帧直接覆盖，避免延迟累积
+      - 每采到一帧发出 frame_ready(seq) 信号，GUI 线程通过 latest() 取帧
+      - 若指定了 sink（如 FramePipeline.submit），每帧还会在采集线程中直接交给它
+      - 若指定了 pool（FramePool），RGB 帧从池中取缓冲区，由最后的使用者调用 packet.release() 归还
+        （此时 latest() 返回的帧可能已被归还，应只通过 sink 消费帧）
+    """
+    frame_ready = QtCore.pyqtSignal(int)
+    capture_error = QtCore.pyqtSignal(str)
+
+    def __init__(self, source='camera:0', width=1280, height=720, flip=True, realtime=True,
+                 reopen_after=30, sink=None, pool=None, parent=None):
+        super().__init__(parent)
+        self.source = source  # 帧来源描述（见 open_frame_source）或已创建的 FrameSource
+        self.realtime = realtime  # 文件/合成来源是否按原始帧率节拍
+        self.width = width
+        self.height = height
+        self.flip = flip
+        self.reopen_after = reopen_after  # 连续读取失败多少次后重新打开帧来源
+        self.sink = sink
+        self.pool = pool
+
+        self._raw = None  # cap.read 复用的原始BGR缓冲区（仅采集线程使用）
+
+        self._lock = threading.Lock()
+        self._latest = None
+        self._seq = 0
+        self._running = False
+
+    def _open(self):
+        if isinstance(self.source, FrameSource):
+            return self.source
+        return open_frame_source(self.source, self.realtime, self.width, self.height)
+
+    def run(self):
+        self._running = True
+        threading.current_thread().name = 'capture'  # 在追踪/看门狗输出中显示线程名
+        cap = self._open()
+        failures = 0
+
+        while self._running:
+            with TRACER.span('capture', self._seq + 1):
+                ret, raw = cap.read(self._raw)
+            if not ret:
+                if cap.exhausted:
+                    self.capture_error.emit("帧来源已播放完毕")
+                    break
+                failures += 1
+                if failures >= self.reopen_after and not isinstance(self.source, FrameSource):
+                    self.capture_error.emit(f"帧来源连续 {failures} 次读取失败，正在重新打开")
+                    cap.release()
+                    cap = self._open()
+                    failures = 0
+                self.msleep(10)
+                continue
+
+            failures = 0
+            timestamp = time.monotonic()
+            self._raw = raw
+            with TRACER.span('flip', self._seq + 1):
+                frame = self._to_rgb(raw)
+
+            with self._lock:
+                self._seq += 1
+                packet = FramePacket(frame, timestamp, self._seq, self.pool)
+                self._latest = packet
+            if self.sink is not None:
+                self.sink(packet)
+            self.frame_ready.emit(packet.seq)
+
+        cap.release()
+
+    def _to_rgb(self, raw_bgr):
+        """镜像翻转并转换为RGB：只使用一个输出缓冲区（优先取自缓冲池），颜色转换在其上原地完成"""
+        frame = self.pool.acquire(raw_bgr.shape) if self.pool is not None else None
+        if self.flip:
+            frame = cv2.flip(raw_bgr, 1, dst=frame)
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        return cv2.cvtColor(raw_bgr, cv2.COLOR_BGR2RGB, dst=frame)
+
+    def latest(self):
+        """返回最新的 FramePacket（尚无帧时为 None）"""
+        with self._lock:
+            return self._latest
+
+    def stop(self):
+        """停止采集并等待线程退出"""
+        self._running = False
+        self.wait()
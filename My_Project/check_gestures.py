@@ -0,0 +1,257 @@
+"""
+手势识别等价性检查：用录制的关键点逐手比较两条识别路径的结果
+    python check_gestures.py                       # 用固定随机种子临时生成合成关键点
+    python check_gestures.py --recording hands.aclm
+  - 新路径：GestureLogic（GestureFeatureEngine 一次算出所有手的特征 + 手势规则查表）
+  - 参考路径：ReferenceGestureLogic，逐手、逐关节用标量代码计算角度和距离
+比较每只手的手指弯曲状态、各手势判断和单帧手势分类，有不一致时列出并以返回码 1 退出。
+注意：参考路径是按当前规则（已包含按手的大小缩放阈值）重新写的标量实现，
+不是引入特征引擎之前的原始代码，因此只能说明向量化没有改变当前规则的结果，
+不能说明与原始版本的识别结果一致。
+未指定 --recording 时，用固定随机种子生成合成的手部骨架（覆盖全部手势）写入临时文件后比较，
+每次运行的数据相同。
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+from collections import Counter
+
+import numpy as np
+
+from gesture_logic import GestureLogic
+from gesture_rules import classify
+from landmark_recorder import LandmarkRecorder, LandmarkReplayer
+
+# 逐手比较的判断方法（新旧两条路径上同名）
+PREDICATES = ['is_thumb_bent', 'is_index_bent', 'is_middle_bent', 'is_ring_bent', 'is_pinky_bent',
+              'is_pinch', 'is_fist', 'is_thumb_up', 'is_index_up', 'is_five_fingers_open',
+              'is_victory', 'is_iloveyou', 'is_three_fingers_open']
+
+
+class ReferenceGestureLogic:
+    """
+    按当前手势规则重新写的逐手标量实现（含按手的大小缩放阈值）：每次判断都通过
+    hand['landmarks']（整数像素）重新计算关节角度和距离。它不是引入 GestureFeatureEngine
+    之前的原始代码。只用于校验，不在运行时使用。
+    """
+    def __init__(self, pinch_threshold_px=40, angle_threshold=30, fist_distance_px=50,
+                 palm_width_px=100, reference_hand_size_px=150):
+        self.pinch_threshold_px = pinch_threshold_px
+        self.angle_threshold = angle_threshold
+        self.fist_distance_px = fist_distance_px
+        self.palm_width_px = palm_width_px
+        self.reference_hand_size_px = reference_hand_size_px
+
+    @staticmethod
+    def _distance(a, b):
+        return math.hypot(a[0]-b[0], a[1]-b[1])
+
+    @staticmethod
+    def _calculate_angle(a, b, c):
+        """三点形成的角度（b为顶点），返回 0-180 度"""
+        ab = (a[0]-b[0], a[1]-b[1])
+        bc = (c[0]-b[0], c[1]-b[1])
+        dot_product = ab[0] * bc[0] + ab[1] * bc[1]
+        mag_ab = math.sqrt(ab[0]**2 + ab[1]**2)
+        mag_bc = math.sqrt(bc[0]**2 + bc[1]**2)
+        if mag_ab == 0 or mag_bc == 0:
+            return 180.0  # 避免除以零
+        cos_theta = max(min(dot_product / (mag_ab * mag_bc), 1.0), -1.0)
+        return math.degrees(math.acos(cos_theta))
+
+    def _scaled(self, threshold_px, hand):
+        lm = hand['landmarks']
+        size = self._distance(lm[0], lm[9])
+        if size <= 0:
+            return threshold_px
+        return threshold_px * size / self.reference_hand_size_px
+
+    def is_pinch(self, hand):
+        lm = hand['landmarks']
+        return self._distance(lm[4][:2], lm[8][:2]) < self._scaled(self.pinch_threshold_px, hand)
+
+    def is_thumb_bent(self, hand):
+        lm = hand['landmarks']
+        angle1 = self._calculate_angle(lm[0], lm[1], lm[2])
+        angle2 = self._calculate_angle(lm[1], lm[2], lm[3])
+        return angle1 < self.angle_threshold + 20 or angle2 < self.angle_threshold
+
+    def _finger_bent(self, hand, mcp):
+        """食指/中指/无名指/小指：mcp 为掌指关节编号（5/9/13/17）"""
+        lm = hand['landmarks']
+        angle1 = self._calculate_angle(lm[0], lm[mcp], lm[mcp + 1])
+        angle2 = self._calculate_angle(lm[mcp], lm[mcp + 1], lm[mcp + 2])
+        return angle1 < self.angle_threshold or angle2 < self.angle_threshold - 10
+
+    def is_index_bent(self, hand):
+        return self._finger_bent(hand, 5)
+
+    def is_middle_bent(self, hand):
+        return self._finger_bent(hand, 9)
+
+    def is_ring_bent(self, hand):
+        return self._finger_bent(hand, 13)
+
+    def is_pinky_bent(self, hand):
+        return self._finger_bent(hand, 17)
+
+    def _open(self, hand):
+        """(拇指, 食指, 中指, 无名指, 小指) 是否张开"""
+        return (not self.is_thumb_bent(hand), not self.is_index_bent(hand), not self.is_middle_bent(hand),
+                not self.is_ring_bent(hand), not self.is_pinky_bent(hand))
+
+    def is_five_fingers_open(self, hand):
+        lm = hand['landmarks']
+        return (all(self._open(hand)) and
+                self._distance(lm[1][:2], lm[17][:2]) > self._scaled(self.palm_width_px, hand))
+
+    def is_three_fingers_open(self, hand):
+        return self._open(hand) == (True, True, True, False, False)
+
+    def is_fist(self, hand):
+        lm = hand['landmarks']
+        return (not any(self._open(hand)) and
+                self._distance(lm[4][:2], lm[5][:2]) < self._scaled(self.fist_distance_px, hand))
+
+    def is_index_up(self, hand):
+        return self._open(hand) == (False, True, False, False, False)
+
+    def is_thumb_up(self, hand):
+        lm = hand['landmarks']
+        return self._open(hand) == (True, False, False, False, False) and lm[4][1] < lm[1][1]
+
+    def is_victory(self, hand):
+        return self._open(hand) == (False, True, True, False, False)
+
+    def is_iloveyou(self, hand):
+        return self._open(hand) == (True, True, True, False, False)
+
+    def gesture(self, hand):
+        """单帧手势分类（不做多帧投票），优先级与原 get_hand_gesture 相同"""
+        for name, check in (("pinch", self.is_pinch), ("Closed_Fist", self.is_fist),
+                            ("Thumb_Up", self.is_thumb_up), ("Pointing_Up", self.is_index_up),
+                            ("Open_Palm", self.is_five_fingers_open), ("Victory", self.is_victory),
+                            ("ILoveYou", self.is_iloveyou), ("three_fingers_open", self.is_three_fingers_open)):
+            if check(hand):
+                return name
+        return "Unknown"
+
+
+def compare(replayer, logic=None, reference=None, verbose=True):
+    """逐帧比较两条路径，返回 (不一致列表, 参考路径手势计数, 比较的手数)"""
+    logic = logic or GestureLogic()
+    reference = reference or ReferenceGestureLogic(
+        logic.pinch_threshold_px, logic.angle_threshold, logic.fist_distance_px,
+        logic.palm_width_px, logic.reference_hand_size_px)
+    mismatches = []
+    gestures = Counter()
+    total = 0
+    for i in range(len(replayer)):
+        hands = replayer.hands_at(i)
+        logic.prepare(hands)  # 与运行时相同：整帧所有手一次算出特征
+        for j, hand in enumerate(hands):
+            total += 1
+            for name in PREDICATES:
+                new, old = bool(getattr(logic, name)(hand)), bool(getattr(reference, name)(hand))
+                if new != old:
+                    mismatches.append((i, j, name, old, new))
+            old = reference.gesture(hand)
+            new = classify(logic.gesture_table, logic, hand, logic.features(hand))
+            gestures[old] += 1
+            if new != old:
+                mismatches.append((i, j, 'gesture', old, new))
+    if verbose:
+        for i, j, name, old, new in mismatches[:20]:
+            print(f"  帧 {i} 手 {j} {name}: 参考 {old} / 新 {new}")
+    return mismatches, gestures, total
+
+
+# 合成手部骨架：每根手指的基准方向（弧度）和各节长度（像素）
+FINGER_DIRECTIONS = [-2.2, -1.85, -1.57, -1.3, -1.05]
+THUMB_SEGMENTS = [40, 35, 30, 25]
+FINGER_SEGMENTS = [50, 35, 25, 20]
+# 各手势的手指弯曲程度模板（拇指、食指、中指、无名指、小指；每个关节的转角，0 为伸直），
+# None 为随机弯曲（多数落在阈值附近，用于检查边界情况）
+B = 2.9
+POSE_TEMPLATES = [
+    (0, 0, 0, 0, 0), (B, B, B, B, B), (0, B, B, B, B), (B, 0, B, B, B),
+    (B, 0, 0, B, B), (0, 0, 0, B, B), None, None,
+]
+
+
+def synthetic_hand(rng, bends=None):
+    """按弯曲模板生成一只随机位置、大小、抖动的手 (21, 3)，少量样本带退化关节或杂乱点"""
+    wrist = np.array([rng.uniform(100, 1200), rng.uniform(100, 700)])
+    scale = rng.uniform(0.4, 2.0)
+    points = np.zeros((21, 3))
+    points[0, :2] = wrist
+    for finger in range(5):
+        angle = FINGER_DIRECTIONS[finger] + rng.normal(0, 0.2)
+        if bends is None:
+            bend, spread = rng.choice([0, 0.3, 1.0, 1.6, 2.5, 3.0]), (0.3, 1.0)
+        else:
+            bend, spread = bends[finger], (0.9, 1.05)
+        p = wrist.copy()
+        segments = FINGER_SEGMENTS if finger else THUMB_SEGMENTS
+        for k in range(4):
+            if k > 0:
+                angle += bend * rng.uniform(*spread) * (1 if finger else -1)
+            p = p + scale * segments[k] * np.array([math.cos(angle), math.sin(angle)])
+            points[1 + 4 * finger + k, :2] = p
+    if bends is not None and min(bends) > 0 and rng.random() < 0.7:
+        # 握拳：拇指尖收到食指根附近
+        points[4, :2] = points[5, :2] + rng.normal(0, 5 * scale, 2)
+    elif rng.random() < 0.15:
+        # 捏合：食指尖移到拇指尖附近
+        points[8, :2] = points[4, :2] + rng.normal(0, 8 * scale, 2)
+    points[:, :2] += rng.normal(0, 2, (21, 2))
+    if rng.random() < 0.05:
+        points[:, :2] = rng.uniform(0, 1280, (21, 2))
+    if rng.random() < 0.03:
+        points[5, :2] = points[6, :2]  # 退化关节（两点重合）
+    return points.astype(np.float32)
+
+
+def write_fixture(path, frames=160, seed=17):
+    rng = np.random.default_rng(seed)
+    recorder = LandmarkRecorder(path)
+    for i in range(frames):
+        hands = []
+        for handedness in ('Right', 'Left'):
+            template = POSE_TEMPLATES[rng.integers(len(POSE_TEMPLATES))]
+            hands.append({'landmarks': synthetic_hand(rng, template), 'handedness': handedness, 'score': 1.0})
+        recorder.write(i / 30, i + 1, hands, (1280, 720))
+    recorder.close()
+    print(f"已写入 {frames} 帧关键点: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='比较向量化手势识别与参考实现的结果')
+    parser.add_argument('--recording', help='关键点录制文件（默认用固定随机种子临时生成合成数据）')
+    args = parser.parse_args()
+
+    if args.recording:
+        replayer = LandmarkReplayer(args.recording, loop=False)
+        frames = len(replayer)
+        mismatches, gestures, total = compare(replayer)
+        replayer.close()
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'gesture_check.aclm')
+            write_fixture(path)
+            replayer = LandmarkReplayer(path, loop=False)
+            frames = len(replayer)
+            mismatches, gestures, total = compare(replayer)
+            replayer.close()
+    print(f"比较了 {frames} 帧 / {total} 只手，手势分布: {dict(gestures)}")
+    if mismatches:
+        print(f"发现 {len(mismatches)} 处不一致")
+        return 1
+    print("向量化识别结果与参考实现完全一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
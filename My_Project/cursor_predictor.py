@@ -0,0 +1,118 @@
+import threading
+
+import numpy as np
+
+
+class LatencyEstimator:
+    """
+    流水线延迟估计：对每帧实测的“采集时间戳 -> 界面处理完成”耗时做指数滑动平均（秒）
+    """
+    def __init__(self, alpha=0.1, initial=0.05):
+        self.alpha = alpha
+        self.value = initial
+        self.samples = 0
+
+    def observe(self, latency):
+        if self.samples == 0:
+            self.value = latency
+        else:
+            self.value += self.alpha * (latency - self.value)
+        self.samples += 1
+        return self.value
+
+
+class CursorPredictor:
+    """
+    延迟补偿的光标预测：用 LandmarkTimeline 中最近三次推理结果估计每只手关键点的速度和加速度，
+    把位置外推到预计的显示时刻，抵消采集、推理和绘制的延迟。
+      - 置信度：相邻两段速度方向一致且大小接近时接近 1；运动突变（急停、折返、抖动）时降低。
+        结果按置信度在 timeline 的插值/匀速外推与加速度预测之间过渡，置信度为 0 时与
+        timeline.query 相同，避免光标甩过头。置信度在帧间平滑，不会突然跳变
+      - 外推时长不超过 max_lead 秒，预测位移不超过 max_offset_px 像素
+      - 速度低于 min_speed_px 像素/秒视为静止，不做预测
+      - 目标时刻不晚于最新样本时，或置信度低于 min_confidence 时，直接使用 timeline 的结果
+    predict() 在GUI线程中调用；轨迹超时移除时（流水线线程）调用 forget() 清理该手的状态。
+    """
+    def __init__(self, timeline, max_lead=0.15, max_offset_px=120, min_speed_px=30, confidence_alpha=0.3,
+                 min_confidence=0.05):
+        self.timeline = timeline
+        self.max_lead = max_lead
+        self.max_offset_px = max_offset_px
+        self.min_speed_px = min_speed_px
+        self.confidence_alpha = confidence_alpha
+        self.min_confidence = min_confidence
+        self.latency = LatencyEstimator()
+        self._lock = threading.Lock()
+        self._confidence = {}  # (key, landmark) -> (计算时的最新样本时间戳, 平滑后的置信度)
+
+    def observe_latency(self, latency):
+        """记录一帧实测的端到端延迟（秒）"""
+        return self.latency.observe(latency)
+
+    def confidence(self, key, landmark):
+        with self._lock:
+            return self._confidence.get((key, landmark), (None, 0.0))[1]
+
+    def forget(self, key):
+        """移除 key 这只手所有关键点的置信度状态（轨迹超时移除时调用）"""
+        with self._lock:
+            for ck in [ck for ck in self._confidence if ck[0] == key]:
+                del self._confidence[ck]
+
+    def _query(self, key, landmark, t):
+        point = self.timeline.query(key, t, landmark)
+        return None if point is None else point[:2]
+
+    def _motion_confidence(self, v0, v1):
+        """两段速度的一致程度：方向夹角余弦 × 大小比值，范围 [0, 1]"""
+        s0 = float(np.hypot(*v0))
+        s1 = float(np.hypot(*v1))
+        if s0 < self.min_speed_px or s1 < self.min_speed_px:
+            return 0.0
+        cos = float(np.dot(v0, v1)) / (s0 * s1)
+        return max(0.0, cos) * min(s0, s1) / max(s0, s1)
+
+    def predict(self, key, landmark, t):
+        """
+        预测 key 这只手的第 landmark 个关键点在 t 时刻的 (x, y)；没有数据时返回 None
+        """
+        ck = (key, landmark)
+        times, points = self.timeline.recent(key, 3)
+        if not times:
+            with self._lock:
+                self._confidence.pop(ck, None)
+            return None
+        t_last = times[-1]
+        if t - t_last > self.timeline.max_age:
+            return None
+        if t <= t_last or len(times) < 3:
+            return self._query(key, landmark, t)
+
+        p0, p1, p2 = (p[landmark, :2] for p in points)
+        dt1 = times[1] - times[0]
+        dt2 = times[2] - times[1]
+        v0 = (p1 - p0) / dt1
+        v1 = (p2 - p1) / dt2
+        a = (v1 - v0) / ((dt1 + dt2) / 2)
+
+        # 置信度帧间平滑：每个新样本只更新一次，与查询频率无关
+        with self._lock:
+            t_seen, c = self._confidence.get(ck, (None, 0.0))
+            if t_seen != t_last:
+                c += self.confidence_alpha * (self._motion_confidence(v0, v1) - c)
+                self._confidence[ck] = (t_last, c)
+        base = self._query(key, landmark, t)
+        if base is None or c < self.min_confidence:
+            # 运动不规律（或刚开始运动）时不做加速度预测，沿用 timeline 的插值/匀速外推
+            return base
+
+        lead = min(t - t_last, self.max_lead)
+        offset = v1 * lead + 0.5 * c * a * lead * lead
+        dist = float(np.hypot(*offset))
+        if dist > self.max_offset_px:
+            offset *= self.max_offset_px / dist
+        return base + c * (p2 + offset - base)
+
+    def display_time(self, capture_timestamp):
+        """以 capture_timestamp 采集的帧预计的显示时刻"""
+        return capture_timestamp + self.latency.value
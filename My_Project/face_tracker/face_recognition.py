@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 import os
+import sys
 import shutil
 import threading
 import tkinter as tk
@@ -14,6 +15,10 @@ CONFIG_PATH = os.path.join(BASE_DIR, 'config.txt')
 HAARCASCADE_PATH = os.path.join(BASE_DIR, 'haarcascade_frontalface_default.xml')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
+# 帧来源模块位于上一级目录
+sys.path.append(os.path.dirname(BASE_DIR))
+from frame_source import open_frame_source
+
 # 首先读取config文件，第一行代表当前已经储存的人名个数，接下来每一行是（id，name）标签和对应的人名
 id_dict = {}  # 字典里存的是id——name键值对
 Total_face_num = 999  # 已经被识别有用户名的人脸个数
@@ -42,8 +47,8 @@ face_cascade = cv2.CascadeClassifier(HAARCASCADE_PATH)
 # 准备好识别方法LBPH方法
 recognizer = cv2.face.LBPHFaceRecognizer_create()
 
-# 打开标号为0的摄像头
-camera = cv2.VideoCapture(0)  # 摄像头
+# 打开帧来源（默认标号为0的摄像头，也可通过命令行参数指定 video:/images:/synthetic）
+camera = open_frame_source(sys.argv[1] if len(sys.argv) > 1 else 'camera:0')  # 摄像头
 success, img = camera.read()  # 从摄像头读取照片
 if camera.isOpened():
     W_size = 0.1 * camera.get(3)
@@ -0,0 +1,106 @@
+from functools import cached_property
+
+# 关键点编号
+WRIST = 0
+INDEX_TIP = 8
+
+
+class FrameContext:
+    """
+    一帧的派生数据：第一次访问时计算并缓存，同一帧内所有使用者拿到的是同一份结果。
+      primary: 主控制手（优先右手，否则第一只手）；left / right: 左手、右手
+      pinches: 每只手的捏合状态；primary_pinch: 主控制手是否捏合
+      index_tip / wrist: 主控制手食指尖、手腕的帧坐标（保留小数），没有手时为 None
+      gesture: 主控制手的稳定手势名（只在主菜单下识别，其他时候为 None）
+      roles: 'primary' / 'Left' / 'Right' -> track_id
+    坐标换算：to_widget(point, widget) 把帧坐标映射为 widget 坐标（整数），
+    每个 widget 尺寸的缩放系数只算一次。
+    """
+    def __init__(self, packet, glogic):
+        self.packet = packet
+        self.glogic = glogic
+        self.frame = packet.frame
+        self.hands = packet.hands
+        self.timestamp = packet.timestamp
+        self.seq = packet.seq
+        self._scales = {}
+
+    @cached_property
+    def frame_size(self):
+        """(宽, 高)"""
+        h, w = self.frame.shape[:2]
+        return w, h
+
+    @cached_property
+    def right(self):
+        return next((h for h in self.hands if h.handedness == 'Right'), None)
+
+    @cached_property
+    def left(self):
+        return next((h for h in self.hands if h.handedness == 'Left'), None)
+
+    @cached_property
+    def primary(self):
+        if self.right is not None:
+            return self.right
+        return self.hands[0] if self.hands else None
+
+    @cached_property
+    def roles(self):
+        return {
+            'primary': self.primary.track_id if self.primary is not None else None,
+            'Left': self.left.track_id if self.left is not None else None,
+            'Right': self.right.track_id if self.right is not None else None,
+        }
+
+    @cached_property
+    def pinches(self):
+        """每只手的捏合状态（与 hands 一一对应）"""
+        return [self.glogic.is_pinch(hand) for hand in self.hands]
+
+    @cached_property
+    def primary_pinch(self):
+        if self.primary is None:
+            return False
+        return self.pinches[self._primary_index]
+
+    @cached_property
+    def _primary_index(self):
+        return next(i for i, hand in enumerate(self.hands) if hand is self.primary)
+
+    @cached_property
+    def index_tip(self):
+        if self.primary is None:
+            return None
+        x, y = self.primary.points[INDEX_TIP, :2].tolist()
+        return x, y
+
+    @cached_property
+    def wrist(self):
+        if self.primary is None:
+            return None
+        x, y = self.primary.points[WRIST, :2].tolist()
+        return x, y
+
+    @cached_property
+    def gesture(self):
+        gestures = self.packet.hand_gestures
+        if self.primary is None or gestures is None:
+            return None
+        return gestures[self._primary_index]
+
+    def scale(self, widget):
+        """帧坐标到 widget 坐标的缩放系数 (sx, sy)"""
+        size = (widget.width(), widget.height())
+        scale = self._scales.get(size)
+        if scale is None:
+            w, h = self.frame_size
+            scale = self._scales[size] = (size[0] / w, size[1] / h)
+        return scale
+
+    def to_widget(self, point, widget):
+        """把帧坐标 (x, y) 映射为 widget 坐标（整数）；point 为 None 时返回 None"""
+        if point is None:
+            return None
+        sx, sy = self.scale(widget)
+        return int(point[0] * sx), int(point[1] * sy)
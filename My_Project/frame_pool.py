@@ -0,0 +1,61 @@
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+
+class FramePool:
+    """
+    按 (shape, dtype) 分组的可复用图像缓冲区池，用于热路径中的 OpenCV 输出（dst=）：
+      - acquire(shape) 优先取回已归还的缓冲区（命中），没有空闲时新分配（未命中）
+      - release(buf) 归还缓冲区；每种形状最多保留 buffers_per_shape 个，多余的交给GC
+    buffers_per_shape 应与同时在途的帧数相当（队列长度 + 各阶段正在处理的帧 + 正在显示的帧），
+    这样稳定运行后每帧都不再分配新内存，避免长时间运行时的内存抖动和GC停顿。
+    线程安全，可同时被采集线程、推理线程和GUI线程使用。
+    """
+    def __init__(self, buffers_per_shape=8):
+        self.buffers_per_shape = buffers_per_shape
+        self._free = defaultdict(list)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0  # 池已满时被丢弃的归还缓冲区数
+
+    @staticmethod
+    def _key(shape, dtype):
+        return tuple(shape), np.dtype(dtype).str
+
+    def acquire(self, shape, dtype=np.uint8):
+        """取一个指定形状的缓冲区（内容未初始化）"""
+        key = self._key(shape, dtype)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.hits += 1
+                return free.pop()
+            self.misses += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buf):
+        """归还缓冲区；调用方此后不得再读写该缓冲区"""
+        if buf is None:
+            return
+        key = self._key(buf.shape, buf.dtype)
+        with self._lock:
+            free = self._free[key]
+            if len(free) < self.buffers_per_shape:
+                free.append(buf)
+            else:
+                self.discarded += 1
+
+    def stats(self):
+        """返回命中/未命中统计和各形状的空闲缓冲区数"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'discarded': self.discarded,
+                'free': {f"{shape}:{dtype}": len(bufs) for (shape, dtype), bufs in self._free.items()},
+            }
@@ -0,0 +1,224 @@
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource:
+    """
+    帧来源接口，read()/isOpened()/get()/release() 与 cv2.VideoCapture 保持一致，
+    可以直接替换原来的 cv2.VideoCapture(0)。
+      - realtime=True: 按来源帧率节拍输出（模拟真实摄像头）
+      - realtime=False: 尽可能快地输出，用于吞吐量测试
+    read() 返回的都是 BGR 图像。
+    """
+    is_live = False  # 是否为实时设备（实时设备本身就按帧率输出，不需要再节拍）
+
+    def __init__(self, fps=30.0, realtime=True):
+        self.fps = fps
+        self.realtime = realtime
+        self.width = 0
+        self.height = 0
+        self.exhausted = False  # 非循环的有限来源读完后为 True
+        self._next_time = None
+
+    def _pace(self):
+        """实时节拍：等待到下一帧的预定时间"""
+        if not self.realtime or self.is_live or not self.fps:
+            return
+        now = time.monotonic()
+        if self._next_time is None or now - self._next_time > 1.0:
+            # 首帧或落后太多时重新对齐时钟，不追赶
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time += 1.0 / self.fps
+
+    def _read_frame(self, image=None):
+        raise NotImplementedError
+
+    def read(self, image=None):
+        """读取一帧，返回 (ok, frame_bgr)"""
+        self._pace()
+        return self._read_frame(image)
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop_id):
+        """兼容 cv2.VideoCapture.get 的常用属性"""
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps or 0)
+        return 0.0
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """实时摄像头"""
+    is_live = True
+
+    def __init__(self, index=0, width=1280, height=720, realtime=True):
+        super().__init__(fps=None, realtime=realtime)
+        backend = cv2.CAP_DSHOW if sys.platform.startswith('win') else 0
+        self.cap = cv2.VideoCapture(index, backend)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # 尽量让驱动只缓存一帧，减少排队造成的延迟
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def _read_frame(self, image=None):
+        return self.cap.read(image)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """视频文件，loop=True 时播放结束后从头循环"""
+
+    def __init__(self, path, realtime=True, loop=True):
+        self.cap = cv2.VideoCapture(path)
+        super().__init__(fps=self.cap.get(cv2.CAP_PROP_FPS) or 30.0, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def _read_frame(self, image=None):
+        ok, frame = self.cap.read(image)
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read(image)
+        if not ok:
+            self.exhausted = True
+        return ok, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(FrameSource):
+    """目录中的图片序列（按文件名排序），如 face_tracker/data"""
+
+    def __init__(self, directory, fps=30.0, realtime=True, loop=True, size=None):
+        super().__init__(fps=fps, realtime=realtime)
+        self.loop = loop
+        self.size = size  # 可选的统一输出尺寸 (w, h)，图片尺寸不一致时使用
+        self.paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self._index = 0
+        if self.paths:
+            first = cv2.imread(self.paths[0])
+            if first is not None:
+                self.height, self.width = first.shape[:2]
+        if size:
+            self.width, self.height = size
+
+    def _read_frame(self, image=None):
+        if self._index >= len(self.paths):
+            if not self.loop or not self.paths:
+                self.exhausted = True
+                return False, None
+            self._index = 0
+        frame = cv2.imread(self.paths[self._index])
+        self._index += 1
+        if frame is None:
+            return False, None
+        if self.size and (frame.shape[1], frame.shape[0]) != tuple(self.size):
+            frame = cv2.resize(frame, tuple(self.size))
+        return True, frame
+
+    def isOpened(self):
+        return bool(self.paths)
+
+
+class SyntheticSource(FrameSource):
+    """
+    合成画面：渐变背景上一个沿李萨如曲线移动的圆点，
+    无需摄像头和测试素材即可驱动整条流水线（不含真实手部）
+    """
+
+    def __init__(self, width=1280, height=720, fps=30.0, realtime=True, num_frames=None):
+        super().__init__(fps=fps, realtime=realtime)
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames  # None 表示无限输出
+        self._count = 0
+        gradient = np.linspace(0, 255, width, dtype=np.uint8)
+        self._background = np.empty((height, width, 3), dtype=np.uint8)
+        self._background[:, :, 0] = gradient
+        self._background[:, :, 1] = gradient[::-1]
+        self._background[:, :, 2] = 96
+
+    def _read_frame(self, image=None):
+        if self.num_frames is not None and self._count >= self.num_frames:
+            self.exhausted = True
+            return False, None
+        if image is None or image.shape != self._background.shape:
+            image = np.empty_like(self._background)
+        np.copyto(image, self._background)
+        t = self._count / (self.fps or 30.0)
+        cx = int(self.width * (0.5 + 0.35 * np.sin(t * 1.3)))
+        cy = int(self.height * (0.5 + 0.35 * np.sin(t * 1.7)))
+        cv2.circle(image, (cx, cy), 40, (255, 255, 255), -1)
+        self._count += 1
+        return True, image
+
+
+def open_frame_source(spec='camera:0', realtime=True, width=1280, height=720):
+    """
+    按描述字符串创建帧来源：
+      camera:0            实时摄像头（编号）
+      video:path.mp4      视频文件
+      images:dir          图片目录
+      synthetic           合成画面
+    也可直接给出摄像头编号、视频文件路径或图片目录。
+    """
+    kind, _, arg = str(spec).partition(':')
+    if kind == 'camera':
+        return CameraSource(int(arg or 0), width, height, realtime)
+    if kind == 'video':
+        return VideoFileSource(arg, realtime)
+    if kind == 'images':
+        return ImageSequenceSource(arg, realtime=realtime)
+    if kind == 'synthetic':
+        return SyntheticSource(width, height, realtime=realtime)
+
+    # 未写类型前缀时按内容推断
+    if str(spec).isdigit():
+        return CameraSource(int(spec), width, height, realtime)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, realtime=realtime)
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, realtime)
+    raise ValueError(f"无法识别的帧来源: {spec}")
+
+
+def add_source_arguments(parser):
+    """为命令行程序添加 --source / --fast 参数"""
+    parser.add_argument('--source', default='camera:0',
+                        help='帧来源: camera:N | video:PATH | images:DIR | synthetic（默认 camera:0）')
+    parser.add_argument('--fast', action='store_true',
+                        help='文件/合成来源不按原始帧率节拍，尽可能快地输出')
+    return parser
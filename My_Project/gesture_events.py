@@ -0,0 +1,152 @@
+from metrics import METRICS
+
+# 事件类型
+PINCH_START = 'pinch_start'          # 某只手开始捏合
+PINCH_END = 'pinch_end'              # 某只手松开捏合（手丢失时也会先发出）
+GESTURE_CHANGED = 'gesture_changed'  # 某只手的稳定手势发生变化
+HAND_LOST = 'hand_lost'              # 某只手从画面中消失
+CURSOR_MOVED = 'cursor_moved'        # 光标位置变化（pos 为 None 表示光标消失）
+EVENT_TYPES = (PINCH_START, PINCH_END, GESTURE_CHANGED, HAND_LOST, CURSOR_MOVED)
+
+
+class GestureEvent:
+    """
+    一个手势事件：
+      type: 事件类型（EVENT_TYPES 之一）
+      track_id / handedness: 产生事件的手
+      pos: 光标位置（应用坐标），该手不是光标手时为 None
+      gesture / previous: GESTURE_CHANGED 的新旧手势
+      pinching: 事件发生时该手是否处于捏合状态
+      timestamp: 对应帧的采集时间戳（秒）
+    """
+    __slots__ = ('type', 'track_id', 'handedness', 'pos', 'gesture', 'previous', 'pinching', 'timestamp')
+
+    def __init__(self, type, track_id=None, handedness=None, pos=None, gesture=None, previous=None,
+                 pinching=False, timestamp=None):
+        self.type = type
+        self.track_id = track_id
+        self.handedness = handedness
+        self.pos = pos
+        self.gesture = gesture
+        self.previous = previous
+        self.pinching = pinching
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"GestureEvent({self.type}, track={self.track_id}, pos={self.pos}, gesture={self.gesture})"
+
+
+class GestureEventBus:
+    """
+    手势事件总线：应用按事件类型订阅回调，只在状态变化时收到通知，不再每帧轮询。
+    post() 把事件放入本帧队列，flush() 在帧末按顺序分发；
+    同一帧内的多次 CURSOR_MOVED 合并为最后一次。只在GUI线程中使用。
+    """
+    def __init__(self):
+        self._subscribers = {event_type: [] for event_type in EVENT_TYPES}
+        self._queue = []
+
+    def subscribe(self, event_type, callback):
+        if event_type not in self._subscribers:
+            raise ValueError(f"未知的手势事件类型: {event_type}")
+        if callback not in self._subscribers[event_type]:
+            self._subscribers[event_type].append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        callbacks = self._subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def disconnect(self, owner):
+        """移除 owner 对象的所有订阅（回调为 owner 的方法）"""
+        for callbacks in self._subscribers.values():
+            callbacks[:] = [cb for cb in callbacks if getattr(cb, '__self__', None) is not owner]
+
+    def post(self, event):
+        if event.type == CURSOR_MOVED:
+            # 合并本帧中尚未分发的光标移动，只保留最新位置
+            for i, queued in enumerate(self._queue):
+                if queued.type == CURSOR_MOVED:
+                    del self._queue[i]
+                    METRICS.count('gesture_events.coalesced')
+                    break
+        self._queue.append(event)
+
+    def flush(self):
+        """分发本帧的全部事件，返回分发的事件数"""
+        queue, self._queue = self._queue, []
+        for event in queue:
+            for callback in list(self._subscribers[event.type]):
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"手势事件 {event.type} 处理出错: {e}")
+        if queue:
+            METRICS.count('gesture_events', len(queue))
+        return len(queue)
+
+
+class GestureEventTracker:
+    """
+    把每帧的手部状态转换为边沿触发的事件：
+    记录每个 track_id 上一帧的捏合状态和手势，状态变化时才向总线发送事件。
+    一只手超过 lost_after 秒没有出现才发出 HAND_LOST，偶尔一两帧漏检不会打断捏合。
+    """
+    def __init__(self, bus, lost_after=0.25):
+        self.bus = bus
+        self.lost_after = lost_after
+        self._pinching = {}   # track_id -> bool
+        self._gestures = {}   # track_id -> 手势名
+        self._handedness = {}
+        self._last_seen = {}  # track_id -> 最近一次出现的时间戳
+        self._cursor = None   # (track_id, pos)
+
+    def update(self, hands, pinches, gestures=None, cursor=None, timestamp=None):
+        """
+        hands: 本帧的 Hand 列表（需已分配 track_id）
+        pinches: 与 hands 对应的捏合状态
+        gestures: 与 hands 对应的稳定手势名；None 表示本帧没有识别手势，不产生 GESTURE_CHANGED
+        cursor: (track_id, pos) 光标手及其应用坐标，没有光标时为 None
+        """
+        post = self.bus.post
+        cursor_id, cursor_pos = cursor if cursor else (None, None)
+        seen = set()
+        for i, hand in enumerate(hands):
+            tid = hand.track_id
+            seen.add(tid)
+            self._handedness[tid] = hand.handedness
+            self._last_seen[tid] = timestamp
+            pos = cursor_pos if tid == cursor_id else None
+
+            pinching = bool(pinches[i])
+            if pinching != self._pinching.get(tid, False):
+                post(GestureEvent(PINCH_START if pinching else PINCH_END, tid, hand.handedness, pos,
+                                  pinching=pinching, timestamp=timestamp))
+            self._pinching[tid] = pinching
+
+            if gestures is not None:
+                gesture = gestures[i]
+                previous = self._gestures.get(tid)
+                if gesture != previous:
+                    post(GestureEvent(GESTURE_CHANGED, tid, hand.handedness, pos, gesture, previous,
+                                      pinching, timestamp))
+                self._gestures[tid] = gesture
+
+        lost = [tid for tid in self._handedness if tid not in seen and
+                (timestamp is None or timestamp - self._last_seen[tid] > self.lost_after)]
+        for tid in lost:
+            handedness = self._handedness.pop(tid)
+            self._last_seen.pop(tid, None)
+            if self._pinching.pop(tid, False):
+                post(GestureEvent(PINCH_END, tid, handedness, timestamp=timestamp))
+            self._gestures.pop(tid, None)
+            post(GestureEvent(HAND_LOST, tid, handedness, timestamp=timestamp))
+
+        new_cursor = (cursor_id, cursor_pos) if cursor_pos is not None else None
+        if new_cursor != self._cursor:
+            self._cursor = new_cursor
+            post(GestureEvent(CURSOR_MOVED, cursor_id, self._handedness.get(cursor_id), cursor_pos,
+                              pinching=self._pinching.get(cursor_id, False), timestamp=timestamp))
+
+    def pinching(self, track_id):
+        return self._pinching.get(track_id, False)
@@ -0,0 +1,119 @@
+import numpy as np
+
+# 手指状态位：对应位为 1 表示该手指张开
+THUMB = 1
+INDEX = 2
+MIDDLE = 4
+RING = 8
+PINKY = 16
+ALL_FINGERS = THUMB | INDEX | MIDDLE | RING | PINKY
+FINGER_BITS = (THUMB, INDEX, MIDDLE, RING, PINKY)
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+# 每根手指两个关节角（顶点为中间的关键点），顺序与 FINGER_BITS 一致
+JOINTS = np.array([
+    (0, 1, 2), (1, 2, 3),      # 拇指：手腕-拇指根-第一关节，拇指根-第一关节-第二关节
+    (0, 5, 6), (5, 6, 7),      # 食指
+    (0, 9, 10), (9, 10, 11),   # 中指
+    (0, 13, 14), (13, 14, 15),  # 无名指
+    (0, 17, 18), (17, 18, 19),  # 小指
+])
+
+# 关键距离
+HAND_SIZE = 0   # 手腕(0)-中指根(9)：手掌尺寸
+PINCH = 1       # 拇指尖(4)-食指尖(8)：捏合
+FIST = 2        # 拇指尖(4)-食指根(5)：握拳
+PALM_WIDTH = 3  # 拇指根(1)-小指根(17)：手掌张开度
+DISTANCE_PAIRS = np.array([(0, 9), (4, 8), (4, 5), (1, 17)])
+
+# 一次取出计算所需的全部关键点：[关节起点 x10, 关节顶点 x10, 关节终点 x10, 距离起点 x4, 距离终点 x4]
+_GATHER = np.concatenate([JOINTS.T.ravel(), DISTANCE_PAIRS.T.ravel()])
+_THUMB_TIP = 31  # _GATHER 中拇指尖(4)的位置
+_THUMB_MCP = 33  # _GATHER 中拇指根(1)的位置
+
+
+class HandFeatures:
+    """
+    一只手的特征：
+      angles: 10 个关节角（度），顺序同 JOINTS
+      distances: 4 个关键距离（像素），下标为 HAND_SIZE / PINCH / FIST / PALM_WIDTH
+      mask: 5 位手指状态位（张开为 1）
+      thumb_up: 拇指尖是否高于拇指根（y 更小）
+    """
+    __slots__ = ('angles', 'distances', 'mask', 'thumb_up', 'engine')
+
+    def __init__(self, angles, distances, mask, thumb_up, engine=None):
+        self.angles = angles
+        self.distances = distances
+        self.mask = mask
+        self.thumb_up = thumb_up
+        self.engine = engine  # 计算该特征的引擎（阈值不同的引擎不能复用特征）
+
+    @property
+    def hand_size(self):
+        return self.distances[HAND_SIZE]
+
+    def is_open(self, finger_bit):
+        return bool(self.mask & finger_bit)
+
+    def vector(self):
+        """特征向量：10 个关节角 + 按手掌尺寸归一化的 3 个距离"""
+        size = self.distances[HAND_SIZE] or 1.0
+        return np.concatenate([self.angles, self.distances[1:] / size])
+
+
+class GestureFeatureEngine:
+    """
+    一次 NumPy 计算所有手的全部关节角、关键距离和手指状态位，
+    取代逐个手指、逐个手势重复调用的标量角度计算。
+    弯曲规则与 GestureLogic 原有规则一致：
+      - 拇指：第一关节角 < 阈值+20 或第二关节角 < 阈值 视为弯曲
+      - 其他手指：第一关节角 < 阈值 或第二关节角 < 阈值-10 视为弯曲
+    坐标先截断为整数像素，与原来基于整数关键点的判断结果一致。
+    """
+    def __init__(self, angle_threshold=30):
+        self.angle_threshold = angle_threshold
+        t = angle_threshold
+        # 每根手指第一、第二关节的弯曲阈值
+        self.first_joint_thresholds = np.array([t + 20, t, t, t, t], dtype=np.float64)
+        self.second_joint_thresholds = np.array([t, t - 10, t - 10, t - 10, t - 10], dtype=np.float64)
+
+    @staticmethod
+    def _points(hand):
+        points = getattr(hand, 'points', None)
+        if points is not None:
+            return points
+        return np.asarray(hand['landmarks'], dtype=np.float64)
+
+    def compute(self, hands):
+        """计算 hands 中每只手的 HandFeatures，返回列表"""
+        if not hands:
+            return []
+        if len(hands) == 1:
+            gathered = self._points(hands[0])[None, _GATHER, :2]
+        else:
+            gathered = np.stack([self._points(hand) for hand in hands])[:, _GATHER, :2]
+        # 截断为整数像素后把 (x, y) 视为复数 x + yj，向量运算一次完成
+        z = np.trunc(gathered.astype(np.float64)).view(np.complex128)[..., 0]  # (n, 38)
+
+        # 关节角：顶点 b 处向量 ba 与 bc 的夹角；任一向量长度为 0 时按 180 度处理
+        b = z[:, 10:20]
+        prod = (z[:, 20:30] - b) * (z[:, 0:10] - b).conj()
+        angles = np.degrees(np.abs(np.arctan2(prod.imag, prod.real)))  # (n, 10)
+        angles[prod == 0] = 180.0
+
+        distances = np.abs(z[:, 30:34] - z[:, 34:38])  # (n, 4)
+
+        # 手指状态位：任一关节角低于阈值即视为弯曲
+        bent = ((angles[:, 0::2] < self.first_joint_thresholds) |
+                (angles[:, 1::2] < self.second_joint_thresholds))
+        thumb_up = (z[:, _THUMB_TIP].imag < z[:, _THUMB_MCP].imag).tolist()
+
+        features = []
+        for i, row in enumerate(bent.tolist()):
+            mask = 0
+            for bit, is_bent in zip(FINGER_BITS, row):
+                if not is_bent:
+                    mask |= bit
+            features.append(HandFeatures(angles[i], distances[i], mask, thumb_up[i], self))
+        return features
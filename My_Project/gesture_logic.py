@@ -1,28 +1,48 @@
 import math
 import time
-from collections import deque
+
+from gesture_features import (GestureFeatureEngine, THUMB, INDEX, MIDDLE, RING, PINKY,
+                              ALL_FINGERS, PINCH, FIST, PALM_WIDTH)
+from gesture_rules import DEFAULT_RULES, compile_rules, classify
+from hand_tracks import GestureVote, DwellState
 
 class GestureLogic:
     """
     高级手势识别逻辑，基于关节角度计算实现更精准的手势判断
     支持多种手势：捏合、握拳、五指张开、三指张开、食指指向上、点赞等
+
+    距离类阈值（捏合、握拳、手掌张开度）以"参考手掌尺寸下的像素值"给出，
+    实际判断时按当前手掌尺寸（手腕到中指根的距离）等比例缩放，
+    因此与推理分辨率、手离摄像头的远近无关。
     """
     def __init__(self, 
                  pinch_threshold_px=40, 
                  dwell_time=0.6,
                  angle_threshold=30,  # 关节弯曲角度阈值（度）
-                 gesture_stability=3):  # 手势稳定帧数
+                 gesture_stability=3,  # 手势稳定帧数
+                 fist_distance_px=50,  # 握拳时拇指尖到食指根的最大距离
+                 palm_width_px=100,  # 五指张开时拇指根到小指根的最小距离
+                 reference_hand_size_px=150,  # 参考手掌尺寸（手腕到中指根的像素距离）
+                 rules=None):  # 手势定义表（GestureRule 列表），默认为 DEFAULT_RULES
         self.pinch_threshold_px = pinch_threshold_px
+        self.fist_distance_px = fist_distance_px
+        self.palm_width_px = palm_width_px
+        self.reference_hand_size_px = reference_hand_size_px
         self.dwell_time = dwell_time
         self.angle_threshold = angle_threshold  # 小于此角度认为关节弯曲
+        self.feature_engine = GestureFeatureEngine(angle_threshold)
+        # 手势定义在启动时编译为按手指状态位索引的查找表
+        self.rules = list(rules or DEFAULT_RULES)
+        self.gesture_table = compile_rules(self.rules)
         self.gesture_stability = gesture_stability  # 需要连续识别相同手势的帧数
         
-        # 存储最近的手势识别结果，用于稳定性判断
-        self.gesture_history = deque(maxlen=gesture_stability)
+        # 未指定手部轨迹时共用的手势投票（最近的识别结果，用于稳定性判断）；
+        # 多只手时应由 HandTrackManager 为每只手提供各自的投票和停留状态
+        self.votes = GestureVote(gesture_stability, ratio=0.6)
+        self.gesture_history = self.votes.history
         
         # 悬停点击相关变量
-        self._hover_start = None
-        self._hover_pos = None
+        self.dwell = DwellState()
         
         # 存储分类器结果（如果使用外部分类器）
         self.classifier_result = None
@@ -32,32 +52,32 @@ class GestureLogic:
         """计算两点之间的欧氏距离"""
         return math.hypot(a[0]-b[0], a[1]-b[1])
 
-    @staticmethod
-    def _calculate_angle(a, b, c):
-        """
-        计算三点形成的角度（b为顶点）
-        返回角度（度），0-180
-        """
-        # 向量计算
-        ab = (a[0]-b[0], a[1]-b[1])
-        bc = (c[0]-b[0], c[1]-b[1])
-        
-        # 点积
-        dot_product = ab[0] * bc[0] + ab[1] * bc[1]
-        # 模长
-        mag_ab = math.sqrt(ab[0]**2 + ab[1]** 2)
-        mag_bc = math.sqrt(bc[0]**2 + bc[1]** 2)
-        
-        if mag_ab == 0 or mag_bc == 0:
-            return 180.0  # 避免除以零
-        
-        # 计算余弦值并转换为角度
-        cos_theta = dot_product / (mag_ab * mag_bc)
-        # 防止数值误差导致的范围问题
-        cos_theta = max(min(cos_theta, 1.0), -1.0)
-        theta_rad = math.acos(cos_theta)
-        
-        return math.degrees(theta_rad)
+    def prepare(self, hands):
+        """一次计算多只手的特征（关节角、关键距离、手指状态位）并缓存在 Hand 上"""
+        hands = [hand for hand in hands if hand and hasattr(hand, 'features')]
+        for hand, features in zip(hands, self.feature_engine.compute(hands)):
+            hand.features = features
+
+    def features(self, hand):
+        """返回手的 HandFeatures；Hand 上已有本引擎算出的缓存时直接使用"""
+        features = getattr(hand, 'features', None)
+        if features is not None and features.engine is self.feature_engine:
+            return features
+        features = self.feature_engine.compute([hand])[0]
+        if hasattr(hand, 'features'):
+            hand.features = features
+        return features
+
+    def hand_size(self, hand):
+        """手掌尺寸：手腕(0)到中指根(9)的像素距离"""
+        return self.features(hand).hand_size
+
+    def _scaled(self, threshold_px, hand):
+        """把参考手掌尺寸下的像素阈值换算到当前手掌尺寸"""
+        size = self.hand_size(hand)
+        if size <= 0:
+            return threshold_px
+        return threshold_px * size / self.reference_hand_size_px
 
     def extract_index_tip(self, hands):
         """提取食指指尖位置"""
@@ -67,6 +87,11 @@ class GestureLogic:
         right = next((h for h in hands if h['handedness'] == 'Right'), None)
         chosen = right or hands[0]
         try:
+            points = getattr(chosen, 'points', None)
+            if points is not None:
+                # 保留小数像素，映射到界面坐标后再取整
+                x, y = points[8, :2].tolist()
+                return (x, y)
             x,y,_ = chosen['landmarks'][8]  # 食指尖(8)
             return (x,y)
         except Exception:
@@ -76,33 +101,34 @@ class GestureLogic:
         """判断拇指和食指是否捏合"""
         if not hand:
             return False
-        lm = hand['landmarks']
-        thumb_tip = lm[4][:2]
-        index_tip = lm[8][:2]
-        return self._distance(thumb_tip, index_tip) < self.pinch_threshold_px
+        return self.features(hand).distances[PINCH] < self._scaled(self.pinch_threshold_px, hand)
 
-    def check_dwell_click(self, pos):
-        """基于位置停留判断点击"""
+    def check_dwell_click(self, pos, dwell=None):
+        """
+        基于位置停留判断点击
+        dwell: 该手的 DwellState（如 HandTrack.dwell），默认使用共用状态
+        """
+        if dwell is None:
+            dwell = self.dwell
         now = time.time()
         if pos is None:
-            self._hover_start = None
-            self._hover_pos = None
+            dwell.reset()
             return False
 
-        if self._hover_pos is None:
-            self._hover_pos = pos
-            self._hover_start = now
+        if dwell.pos is None:
+            dwell.pos = pos
+            dwell.start = now
             return False
 
         # 若移动超出容差，则重置
-        if self._distance(pos, self._hover_pos) > 20:
-            self._hover_pos = pos
-            self._hover_start = now
+        if self._distance(pos, dwell.pos) > 20:
+            dwell.pos = pos
+            dwell.start = now
             return False
 
-        if now - self._hover_start >= self.dwell_time:
+        if now - dwell.start >= self.dwell_time:
             # 触发一次点击并重置
-            self._hover_start = now + 9999  # 避免重复触发
+            dwell.start = now + 9999  # 避免重复触发
             return True
 
     def extract_palm_center(self, hands):
@@ -119,68 +145,36 @@ class GestureLogic:
         except Exception:
             return None
 
-    # 手指弯曲判断（基于关节角度）
+    # 手指弯曲判断（基于关节角度，由特征引擎一次算出，这里只查状态位）
     def is_thumb_bent(self, hand):
         """判断拇指是否弯曲"""
         if not hand:
             return True  # 默认视为弯曲
-            
-        lm = hand['landmarks']
-        # 拇指关节点：掌指关节(1)、近节指骨(2)、远节指骨(3)、指尖(4)
-        angle1 = self._calculate_angle(lm[0], lm[1], lm[2])  # 手腕-拇指根-拇指第一关节
-        angle2 = self._calculate_angle(lm[1], lm[2], lm[3])  # 拇指根-第一关节-第二关节
-        
-        # 两个关节中只要有一个明显弯曲，就认为拇指弯曲
-        return angle1 < self.angle_threshold + 20 or angle2 < self.angle_threshold
+        return not self.features(hand).mask & THUMB
 
     def is_index_bent(self, hand):
         """判断食指是否弯曲"""
         if not hand:
             return True
-            
-        lm = hand['landmarks']
-        # 食指关节点：掌指关节(5)、近节指骨(6)、中节指骨(7)、指尖(8)
-        angle1 = self._calculate_angle(lm[0], lm[5], lm[6])  # 手腕-食指根-食指第一关节
-        angle2 = self._calculate_angle(lm[5], lm[6], lm[7])  # 食指根-第一关节-第二关节
-        
-        # 两个关节都需要判断
-        return angle1 < self.angle_threshold or angle2 < self.angle_threshold - 10
+        return not self.features(hand).mask & INDEX
 
     def is_middle_bent(self, hand):
         """判断中指是否弯曲"""
         if not hand:
             return True
-            
-        lm = hand['landmarks']
-        # 中指关节点：掌指关节(9)、近节指骨(10)、中节指骨(11)、指尖(12)
-        angle1 = self._calculate_angle(lm[0], lm[9], lm[10])
-        angle2 = self._calculate_angle(lm[9], lm[10], lm[11])
-        
-        return angle1 < self.angle_threshold or angle2 < self.angle_threshold - 10
+        return not self.features(hand).mask & MIDDLE
 
     def is_ring_bent(self, hand):
         """判断无名指是否弯曲"""
         if not hand:
             return True
-            
-        lm = hand['landmarks']
-        # 无名指关节点：掌指关节(13)、近节指骨(14)、中节指骨(15)、指尖(16)
-        angle1 = self._calculate_angle(lm[0], lm[13], lm[14])
-        angle2 = self._calculate_angle(lm[13], lm[14], lm[15])
-        
-        return angle1 < self.angle_threshold or angle2 < self.angle_threshold - 10
+        return not self.features(hand).mask & RING
 
     def is_pinky_bent(self, hand):
         """判断小指是否弯曲"""
         if not hand:
             return True
-            
-        lm = hand['landmarks']
-        # 小指关节点：掌指关节(17)、近节指骨(18)、中节指骨(19)、指尖(20)
-        angle1 = self._calculate_angle(lm[0], lm[17], lm[18])
-        angle2 = self._calculate_angle(lm[17], lm[18], lm[19])
-        
-        return angle1 < self.angle_threshold or angle2 < self.angle_threshold - 10
+        return not self.features(hand).mask & PINKY
 
     # 手指张开判断（弯曲的反义）
     def is_thumb_open(self, hand):
@@ -203,145 +197,71 @@ class GestureLogic:
         """判断是否五指张开"""
         if not hand:
             return False
-            
-        # 所有手指都必须张开，且手掌有一定张开度
-        return (self.is_thumb_open(hand) and 
-                self.is_index_open(hand) and 
-                self.is_middle_open(hand) and 
-                self.is_ring_open(hand) and 
-                self.is_pinky_open(hand) and
-                # 额外检查手掌张开程度（拇指根到小指根的距离）
-                self._distance(hand['landmarks'][1][:2], hand['landmarks'][17][:2]) > 100)
+        f = self.features(hand)
+        # 所有手指都必须张开，且手掌有一定张开度（拇指根到小指根的距离）
+        return f.mask == ALL_FINGERS and f.distances[PALM_WIDTH] > self._scaled(self.palm_width_px, hand)
 
     def is_three_fingers_open(self, hand):
         """判断是否食指、中指、大拇指张开（三指张开）"""
         if not hand:
             return False
-            
         # 拇指、食指、中指张开，无名指和小指弯曲
-        return (self.is_thumb_open(hand) and 
-                self.is_index_open(hand) and 
-                self.is_middle_open(hand) and 
-                self.is_ring_bent(hand) and 
-                self.is_pinky_bent(hand))
+        return self.features(hand).mask == THUMB | INDEX | MIDDLE
 
     def is_fist(self, hand):
         """判断是否握拳"""
         if not hand:
             return False
-            
-        # 所有手指都弯曲，且拇指包裹在其他手指上
-        thumb_tip = hand['landmarks'][4][:2]
-        index_mcp = hand['landmarks'][5][:2]
-        
-        return (self.is_thumb_bent(hand) and 
-                self.is_index_bent(hand) and 
-                self.is_middle_bent(hand) and 
-                self.is_ring_bent(hand) and 
-                self.is_pinky_bent(hand) and
-                # 拇指尖靠近食指根部，表明握拳状态
-                self._distance(thumb_tip, index_mcp) < 50)
+        f = self.features(hand)
+        # 所有手指都弯曲，且拇指尖靠近食指根部（拇指包裹在其他手指上）
+        return f.mask == 0 and f.distances[FIST] < self._scaled(self.fist_distance_px, hand)
 
     def is_index_up(self, hand):
         """判断是否仅食指张开（指示手势）"""
         if not hand:
             return False
-            
-        # 只有食指张开，其他手指弯曲
-        return (self.is_thumb_bent(hand) and 
-                self.is_index_open(hand) and 
-                self.is_middle_bent(hand) and 
-                self.is_ring_bent(hand) and 
-                self.is_pinky_bent(hand))
+        return self.features(hand).mask == INDEX
 
     def is_thumb_up(self, hand):
         """判断是否点赞手势（仅拇指张开）"""
         if not hand:
             return False
-            
-        # 只有拇指张开，其他手指弯曲
-        return (self.is_thumb_open(hand) and 
-                self.is_index_bent(hand) and 
-                self.is_middle_bent(hand) and 
-                self.is_ring_bent(hand) and 
-                self.is_pinky_bent(hand) and
-                # 确保拇指向上（y坐标低于掌指关节）
-                hand['landmarks'][4][1] < hand['landmarks'][1][1])
+        f = self.features(hand)
+        # 只有拇指张开，且拇指向上（指尖y坐标小于拇指根）
+        return f.mask == THUMB and f.thumb_up
 
     def is_victory(self, hand):
         """判断是否胜利手势（食指和中指张开）"""
         if not hand:
             return False
-            
-        # 食指和中指张开，其他手指弯曲
-        return (self.is_thumb_bent(hand) and 
-                self.is_index_open(hand) and 
-                self.is_middle_open(hand) and 
-                self.is_ring_bent(hand) and 
-                self.is_pinky_bent(hand))
+        return self.features(hand).mask == INDEX | MIDDLE
 
     def is_iloveyou(self, hand):
         """判断是否爱心手势（食指、中指和拇指张开）"""
         if not hand:
             return False
-            
         # 食指、中指和拇指张开，无名指和小指弯曲
-        return (self.is_thumb_open(hand) and 
-                self.is_index_open(hand) and 
-                self.is_middle_open(hand) and 
-                self.is_ring_bent(hand) and 
-                self.is_pinky_bent(hand))
+        return self.features(hand).mask == THUMB | INDEX | MIDDLE
 
     def set_classifier_result(self, result):
         """设置外部分类器的结果"""
         self.classifier_result = result
 
-    def get_hand_gesture(self, hand):
+    def get_hand_gesture(self, hand, votes=None):
         """
         获取稳定的手部手势类型
         加入手势稳定性判断，避免瞬间误判
+        votes: 该手的 GestureVote（如 HandTrack.votes），默认使用共用投票
         """
+        if votes is None:
+            votes = self.votes
         if not hand:
-            self.gesture_history.clear()
+            votes.clear()
             return None
             
-        # 单次手势识别
-        current_gesture = None
-        
-        # 优先判断特殊交互手势
-        if self.is_pinch(hand):
-            current_gesture = "pinch"
-        elif self.is_fist(hand):
-            current_gesture = "Closed_Fist"
-        elif self.is_thumb_up(hand):
-            current_gesture = "Thumb_Up"
-        elif self.is_index_up(hand):
-            current_gesture = "Pointing_Up"
-        elif self.is_five_fingers_open(hand):
-            current_gesture = "Open_Palm"
-        elif self.is_victory(hand):
-            current_gesture = "Victory"
-        elif self.is_iloveyou(hand):
-            current_gesture = "ILoveYou"
-        elif self.is_three_fingers_open(hand):
-            current_gesture = "three_fingers_open"
-        else:
-            current_gesture = "Unknown"
-            
-        # 添加到历史记录
-        self.gesture_history.append(current_gesture)
-        
-        # 只有当连续识别到相同手势时才确认
-        if len(self.gesture_history) == self.gesture_stability:
-            # 检查历史记录中是否大多数是同一手势
-            gesture_counts = {}
-            for g in self.gesture_history:
-                gesture_counts[g] = gesture_counts.get(g, 0) + 1
-            
-            # 找到出现次数最多的手势
-            most_common = max(gesture_counts.items(), key=lambda x: x[1])
-            if most_common[1] >= self.gesture_stability * 0.6:  # 超过60%的帧一致
-                return most_common[0]
-        
-        # 尚未达到稳定状态，返回None或上一次确认的手势
-        return None if len(self.gesture_history) < self.gesture_stability else self.gesture_history[-1]
+        # 单次手势识别：按手指状态位查表，只检查可能匹配的手势的附加条件
+        current_gesture = classify(self.gesture_table, self, hand, self.features(hand))
+
+        # 加入投票：超过60%的帧一致时确认该手势；
+        # 尚未达到稳定状态时返回None（历史未满）或最新一帧的手势
+        return votes.push(current_gesture)
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+from PyQt5 import QtCore
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+from hand import hands_from_landmarks
+from hand_tracker import fit_size
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 依次查找官方手势模型文件
+MODEL_PATHS = [
+    os.path.join(BASE_DIR, 'resource', 'gesture_recognizer.task'),
+    r"C:\Users\Hui\Documents\GitHub\AirCtrl2\My_Project\resource\gesture_recognizer.task",
+]
+
+
+def find_model_path():
+    """返回第一个存在的模型文件路径，找不到时返回 None"""
+    for path in MODEL_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def create_gesture_recognizer(model_path,
+                              running_mode=vision.RunningMode.IMAGE,
+                              num_hands=2,
+                              min_detection_confidence=0.5,
+                              min_tracking_confidence=0.5,
+                              result_callback=None):
+    """按指定运行模式创建 MediaPipe GestureRecognizer"""
+    base_options = python.BaseOptions(model_asset_path=model_path)
+    options = vision.GestureRecognizerOptions(
+        base_options=base_options,
+        running_mode=running_mode,
+        num_hands=num_hands,
+        min_hand_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+        result_callback=result_callback
+    )
+    return vision.GestureRecognizer.create_from_options(options)
+
+
+def convert_recognizer_result(result, width, height, min_score=0.5):
+    """
+    把 GestureRecognizerResult 转换为项目内部格式，返回 (hands, official_gestures)
+    hands: 与 HandTracker.process 相同的 Hand 列表
+    official_gestures: [(wrist_x, wrist_y, category_name)]，只保留置信度高于 min_score 的手势
+    """
+    hands = []
+    official_gestures = []
+    if not result.hand_landmarks:
+        return hands, official_gestures
+
+    labels = []
+    scores = []
+    for i in range(len(result.hand_landmarks)):
+        if i < len(result.handedness):
+            labels.append(result.handedness[i][0].category_name)
+            scores.append(result.handedness[i][0].score)
+        else:
+            labels.append('Right')
+            scores.append(1.0)
+    hands = hands_from_landmarks(result.hand_landmarks, labels, width, height, scores=scores)
+
+    for i, hand_landmarks in enumerate(result.hand_landmarks):
+        if i < len(result.gestures) and result.gestures[i]:
+            # 获取最可能的手势，并使用该手的手腕位置作为显示位置
+            top_gesture = max(result.gestures[i], key=lambda g: g.score)
+            if top_gesture.score > min_score:
+                wrist_x = hand_landmarks[0].x * width
+                wrist_y = hand_landmarks[0].y * height
+                official_gestures.append((wrist_x, wrist_y, top_gesture.category_name))
+
+    return hands, official_gestures
+
+
+class RecognizerTracker:
+    """
+    单次推理模式：用官方 GestureRecognizer 一次推理同时得到 21 个关键点和手势类别，
+    替代 HandTracker + GestureRecognizer 各自做一遍手掌检测和关键点定位。
+    process() 与 HandTracker.process 接口一致；recognize() 额外返回官方手势；
+    recognize_rgb() 直接接受共享的 RGB 帧，不做颜色转换。
+    """
+    def __init__(self, model_path,
+                 max_num_hands=2,
+                 min_detection_confidence=0.7,
+                 min_tracking_confidence=0.7,
+                 inference_size=None,
+                 pool=None):
+        self.inference_size = inference_size  # 推理分辨率上限 (w, h)，按原宽高比缩放；None 表示使用原始分辨率
+        self.pool = pool  # 可选的 FramePool，缩放输出复用池中的缓冲区
+        self.recognizer = create_gesture_recognizer(
+            model_path,
+            running_mode=vision.RunningMode.VIDEO,
+            num_hands=max_num_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self._last_timestamp_ms = -1
+
+    def recognize(self, frame_bgr, timestamp_ms):
+        """
+        处理 BGR 帧，返回 (hands, official_gestures)
+        timestamp_ms: 帧时间戳（毫秒），VIDEO 模式要求单调递增
+        """
+        return self.recognize_rgb(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB), timestamp_ms)
+
+    def recognize_rgb(self, frame_rgb, timestamp_ms):
+        """与 recognize 相同，但输入为 RGB 图像"""
+        # VIDEO 模式下时间戳必须严格递增
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+
+        h, w = frame_rgb.shape[:2]
+        small = frame_rgb
+        pooled = None
+        iw, ih = fit_size(w, h, self.inference_size) if self.inference_size else (w, h)
+        if (iw, ih) != (w, h):
+            # 与 HandTracker 一致：按原宽高比缩小
+            if self.pool is not None:
+                pooled = self.pool.acquire((ih, iw, 3))
+            small = cv2.resize(frame_rgb, (iw, ih), dst=pooled, interpolation=cv2.INTER_AREA)
+        try:
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=small)
+            result = self.recognizer.recognize_for_video(mp_image, timestamp_ms)
+        finally:
+            if pooled is not None:
+                self.pool.release(pooled)
+        # 关键点按显示帧尺寸换算
+        return convert_recognizer_result(result, w, h)
+
+    def process(self, frame_bgr, timestamp_ms=None):
+        """与 HandTracker.process 相同的接口，返回 (frame_bgr, hands_list)"""
+        if timestamp_ms is None:
+            timestamp_ms = self._last_timestamp_ms + 33
+        hands, _ = self.recognize(frame_bgr, timestamp_ms)
+        return frame_bgr, hands
+
+    def close(self):
+        if self.recognizer:
+            self.recognizer.close()
+
+
+class AsyncGestureRecognizer(QtCore.QObject):
+    """
+    LIVE_STREAM 模式的异步手势识别：
+      - submit() 调用 recognize_async 后立即返回，不阻塞调用线程
+      - 识别结果在 MediaPipe 回调线程中转换，通过 result_ready 信号送回 Qt 主线程
+      - 时间戳使用采集时钟（time.monotonic 毫秒），超过 max_age_ms 的结果直接丢弃
+    """
+    result_ready = QtCore.pyqtSignal(object)  # 参数为 official_gestures 列表
+
+    def __init__(self, model_path, num_hands=2, max_age_ms=200, min_score=0.5, parent=None):
+        super().__init__(parent)
+        self.max_age_ms = max_age_ms
+        self.min_score = min_score
+        self.discarded = 0  # 因过期被丢弃的结果数
+
+        self._lock = threading.Lock()
+        self._latest = []
+        self._latest_timestamp_ms = None
+        self._last_submit_ms = -1
+
+        self.recognizer = create_gesture_recognizer(
+            model_path,
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=num_hands,
+            result_callback=self._on_result
+        )
+
+    @staticmethod
+    def now_ms():
+        """采集时钟的当前时间（毫秒），与 FramePacket.timestamp 同源"""
+        return time.monotonic() * 1000
+
+    def submit(self, frame_rgb, timestamp_ms):
+        """提交一帧 RGB 图像进行异步识别"""
+        # LIVE_STREAM 模式下时间戳必须严格递增
+        timestamp_ms = max(int(timestamp_ms), self._last_submit_ms + 1)
+        self._last_submit_ms = timestamp_ms
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        self.recognizer.recognize_async(mp_image, timestamp_ms)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """MediaPipe 结果回调（运行在 MediaPipe 内部线程）"""
+        if self.now_ms() - timestamp_ms > self.max_age_ms:
+            self.discarded += 1
+            return
+        _, gestures = convert_recognizer_result(
+            result, output_image.width, output_image.height, self.min_score)
+        with self._lock:
+            # 回调可能乱序到达，只保留时间戳最新的结果
+            if self._latest_timestamp_ms is not None and timestamp_ms < self._latest_timestamp_ms:
+                return
+            self._latest = gestures
+            self._latest_timestamp_ms = timestamp_ms
+        self.result_ready.emit(gestures)
+
+    def latest(self):
+        """返回最新完成的识别结果；结果已过期时返回空列表"""
+        with self._lock:
+            if self._latest_timestamp_ms is None:
+                return []
+            if self.now_ms() - self._latest_timestamp_ms > self.max_age_ms:
+                return []
+            return self._latest
+
+    def close(self):
+        if self.recognizer:
+            self.recognizer.close()
@@ -0,0 +1,88 @@
+from gesture_features import (THUMB, INDEX, MIDDLE, RING, PINKY, ALL_FINGERS,
+                              PINCH, FIST, PALM_WIDTH)
+
+UNKNOWN = "Unknown"
+
+
+class GestureRule:
+    """
+    一条手势定义：
+      name: 手势名
+      open / bent: 必须张开 / 必须弯曲的手指位（gesture_features 中的 THUMB、INDEX 等）；
+                   两者都未列出的手指不限制
+      constraint: 可选的附加条件 constraint(logic, hand, features) -> bool，
+                  如距离、朝向判断；只在手指状态匹配时才会调用
+    规则列表中越靠前优先级越高。
+    """
+    __slots__ = ('name', 'open', 'bent', 'constraint')
+
+    def __init__(self, name, open=0, bent=0, constraint=None):
+        if open & bent:
+            raise ValueError(f"手势 {name} 的同一手指不能既张开又弯曲")
+        self.name = name
+        self.open = open
+        self.bent = bent
+        self.constraint = constraint
+
+    def matches(self, mask):
+        return (mask & self.open) == self.open and (mask & self.bent) == 0
+
+    def __repr__(self):
+        return f"GestureRule({self.name}, open={self.open:05b}, bent={self.bent:05b})"
+
+
+def compile_rules(rules):
+    """
+    把规则列表编译为按 5 位手指状态位索引的查找表（32 项）：
+    每项是该状态下按优先级排列的候选 (name, constraint) 元组；
+    遇到第一条没有附加条件的规则后，后面的规则不可能被选中，直接截断。
+    """
+    table = []
+    for mask in range(ALL_FINGERS + 1):
+        candidates = []
+        for rule in rules:
+            if not rule.matches(mask):
+                continue
+            candidates.append((rule.name, rule.constraint))
+            if rule.constraint is None:
+                break
+        table.append(tuple(candidates))
+    return table
+
+
+def classify(table, logic, hand, features):
+    """查表分类：只检查当前手指状态下可能匹配的规则的附加条件"""
+    for name, constraint in table[features.mask]:
+        if constraint is None or constraint(logic, hand, features):
+            return name
+    return UNKNOWN
+
+
+# 附加条件（距离阈值按手掌尺寸缩放）
+def _is_pinching(logic, hand, f):
+    return f.distances[PINCH] < logic._scaled(logic.pinch_threshold_px, hand)
+
+
+def _is_thumb_tucked(logic, hand, f):
+    return f.distances[FIST] < logic._scaled(logic.fist_distance_px, hand)
+
+
+def _is_thumb_pointing_up(logic, hand, f):
+    return f.thumb_up
+
+
+def _is_palm_spread(logic, hand, f):
+    return f.distances[PALM_WIDTH] > logic._scaled(logic.palm_width_px, hand)
+
+
+# 默认手势表，顺序与原 get_hand_gesture 的 if/elif 判断顺序一致
+DEFAULT_RULES = [
+    GestureRule("pinch", constraint=_is_pinching),
+    GestureRule("Closed_Fist", bent=ALL_FINGERS, constraint=_is_thumb_tucked),
+    GestureRule("Thumb_Up", open=THUMB, bent=INDEX | MIDDLE | RING | PINKY, constraint=_is_thumb_pointing_up),
+    GestureRule("Pointing_Up", open=INDEX, bent=THUMB | MIDDLE | RING | PINKY),
+    GestureRule("Open_Palm", open=ALL_FINGERS, constraint=_is_palm_spread),
+    GestureRule("Victory", open=INDEX | MIDDLE, bent=THUMB | RING | PINKY),
+    GestureRule("ILoveYou", open=THUMB | INDEX | MIDDLE, bent=RING | PINKY),
+    GestureRule("three_fingers_open", open=THUMB | INDEX | MIDDLE, bent=RING | PINKY),
+]
@@ -0,0 +1,127 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+class LandmarkView:
+    """
+    hand['landmarks'] 的兼容视图：行为与原来的 [(x_px, y_px, z), ...] 列表相同，
+    x、y 截断为整数像素，但元组只在按下标访问时才生成
+    """
+    __slots__ = ('_points',)
+
+    def __init__(self, points):
+        self._points = points
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._points)))]
+        x, y, z = self._points[index].tolist()
+        return (int(x), int(y), z)
+
+    def __iter__(self):
+        for x, y, z in self._points.tolist():
+            yield (int(x), int(y), z)
+
+
+class Hand:
+    """
+    一只手的检测结果：
+      points: (21, 3) float32 连续数组，每行为 (x_px, y_px, z)，x、y 为整帧像素坐标（保留小数）
+      handedness: 'Left' / 'Right'
+      score: 左右手分类置信度
+    迁移期间兼容原来的字典格式：hand['landmarks'][i] 返回 (int x, int y, z) 元组，
+    hand['handedness']、hand['score']、hand.get() 也照常可用。
+    """
+    __slots__ = ('points', 'handedness', 'score', 'features', 'track_id')
+
+    def __init__(self, points, handedness='Right', score=1.0):
+        self.points = points
+        self.handedness = handedness
+        self.score = score
+        self.features = None  # GestureLogic 计算的 HandFeatures 缓存
+        self.track_id = None  # HandTrackManager 分配的跨帧跟踪编号
+
+    @property
+    def landmarks(self):
+        return LandmarkView(self.points)
+
+    @property
+    def xy(self):
+        """(21, 2) 像素坐标视图"""
+        return self.points[:, :2]
+
+    # 字典兼容接口
+    _KEYS = ('landmarks', 'handedness', 'score')
+
+    def __getitem__(self, key):
+        if key == 'landmarks':
+            return LandmarkView(self.points)
+        if key == 'handedness':
+            return self.handedness
+        if key == 'score':
+            return self.score
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def keys(self):
+        return self._KEYS
+
+    def to_dict(self):
+        return {'landmarks': list(self.landmarks), 'handedness': self.handedness, 'score': self.score}
+
+    @classmethod
+    def from_dict(cls, hand):
+        """把原来的字典格式转换为 Hand"""
+        if isinstance(hand, cls):
+            return hand
+        points = np.asarray(hand['landmarks'], dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+        return cls(points, hand['handedness'], hand.get('score', 1.0))
+
+    def __repr__(self):
+        return f"Hand({self.handedness}, score={self.score:.2f}, wrist=({self.points[0, 0]:.0f}, {self.points[0, 1]:.0f}))"
+
+
+def hands_from_landmarks(landmark_lists, handedness, width, height, x0=0, y0=0, scores=None):
+    """
+    批量构造 Hand：把 MediaPipe 输出的多只手归一化关键点一次性转换为像素坐标
+    landmark_lists: 每只手 21 个带 x/y/z 属性的关键点（solutions 的 hand_landmarks.landmark
+                    或 tasks 的 result.hand_landmarks[i]）
+    handedness: 每只手的 'Left'/'Right'
+    width, height: 推理区域在整帧中的像素尺寸；x0, y0: 推理区域左上角在整帧中的位置
+    所有手共享一个 (n, 21, 3) 数组，每只手的 points 是其中连续的一段
+    """
+    n = len(landmark_lists)
+    if n == 0:
+        return []
+    points = np.array([[(lm.x, lm.y, lm.z) for lm in landmarks] for landmarks in landmark_lists],
+                      dtype=np.float32)
+    points[..., 0] *= width
+    points[..., 1] *= height
+    if x0 or y0:
+        points[..., 0] += x0
+        points[..., 1] += y0
+    if scores is None:
+        scores = [1.0] * n
+    return [Hand(points[i], handedness[i], scores[i]) for i in range(n)]
+
+
+def hands_bbox(hands):
+    """所有手关键点的像素包围盒 (x0, y0, x1, y1)，没有手时返回 None"""
+    if not hands:
+        return None
+    xy = np.concatenate([hand.xy for hand in hands])
+    x0, y0 = xy.min(axis=0)
+    x1, y1 = xy.max(axis=0)
+    return int(x0), int(y0), int(x1), int(y1)
@@ -1,49 +1,212 @@
 import mediapipe as mp
 import cv2
+import numpy as np
+
+from hand import hands_from_landmarks, hands_bbox
+from metrics import timed
+
+
+def fit_size(w, h, box):
+    """
+    把 (w, h) 按原宽高比缩小到能放进 box=(bw, bh) 的最大尺寸，不放大；
+    返回 (w, h) 本身表示无需缩放
+    """
+    bw, bh = box
+    scale = min(bw / w, bh / h)
+    if scale >= 1:
+        return w, h
+    return max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+
 
 class HandTracker:
     """
     封装 MediaPipe Hands。process(frame) 接受 BGR 图像，返回 landmark 列表（像素坐标）。
+    process_rgb(frame) 直接接受 RGB 图像（如采集线程输出的共享帧），不做颜色转换、不修改输入。
     每只手为一个长度 21 的 (x, y, z) 列表（x,y 为像素坐标，z 为相对深度）。
+
+    推理分辨率（inference_size=(w, h)）：
+      整帧检测时先把画面按原宽高比缩小到能放进 inference_size 的尺寸再送入模型，
+      关键点仍按显示帧尺寸换算为像素坐标，推理分辨率与显示分辨率互不影响。
+
+    ROI 跟踪模式（roi_tracking=True）：
+      根据上一帧所有手的包围盒（并集，外扩 roi_margin）裁剪画面，缩小到最长边
+      不超过 roi_max_side 后再送入 MediaPipe，关键点再映射回整帧像素坐标。
+      每隔 redetect_interval 帧、或 ROI 内丢失手部时，退回整帧检测以发现新出现的手。
+      裁剪图每帧位置和大小都不同，使用单独的 static_image_mode=True 实例（roi_hands）处理，
+      不与整帧实例共享跟踪状态；从 ROI 退回整帧检测时清除 ROI 状态并重置整帧实例的跟踪。
     """
     def __init__(self,
                  static_image_mode=False,
                  max_num_hands=2,
                  min_detection_confidence=0.7,
-                 min_tracking_confidence=0.7):
+                 min_tracking_confidence=0.7,
+                 roi_tracking=False,
+                 roi_margin=0.3,
+                 roi_max_side=320,
+                 redetect_interval=30,
+                 inference_size=None,
+                 model_complexity=1,
+                 pool=None):
         self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(
+        self._hands_options = dict(
             static_image_mode=static_image_mode,
             max_num_hands=max_num_hands,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
+        self.model_complexity = model_complexity
+        self._pending_complexity = None
+        self.hands = self.mpHands.Hands(model_complexity=model_complexity, **self._hands_options)
+        self.roi_hands = self._create_roi_hands(model_complexity) if roi_tracking else None
         self.mpDraw = mp.solutions.drawing_utils
+        self.inference_size = inference_size  # 整帧推理分辨率上限 (w, h)，按原宽高比缩放；None 表示使用原始分辨率
+        self.pool = pool  # 可选的 FramePool，缩放输出复用池中的缓冲区
+
+        # ROI 跟踪参数
+        self.roi_tracking = roi_tracking
+        self.roi_margin = roi_margin            # 包围盒外扩比例（相对包围盒边长）
+        self.roi_max_side = roi_max_side        # 送入模型的裁剪图最长边（像素）
+        self.redetect_interval = redetect_interval  # 每隔多少帧强制整帧检测
+        self._last_bbox = None                  # 上一帧手部包围盒并集 (x0, y0, x1, y1)
+        self._frames_since_full = 0
+
+    def _create_roi_hands(self, complexity):
+        """裁剪图专用实例：每张裁剪图独立检测，不沿用上一张裁剪图（坐标系不同）的跟踪结果"""
+        options = dict(self._hands_options, static_image_mode=True)
+        return self.mpHands.Hands(model_complexity=complexity, **options)
+
+    def set_model_complexity(self, complexity):
+        """
+        切换 MediaPipe 模型复杂度（0 轻量 / 1 完整）。
+        模型在下一次 process() 调用时于推理线程中重建，避免与正在进行的推理冲突。
+        """
+        if complexity != self.model_complexity:
+            self._pending_complexity = complexity
+
+    def _apply_pending_complexity(self):
+        complexity = self._pending_complexity
+        if complexity is None:
+            return
+        self._pending_complexity = None
+        self.hands.close()
+        self.hands = self.mpHands.Hands(model_complexity=complexity, **self._hands_options)
+        if self.roi_hands:
+            self.roi_hands.close()
+            self.roi_hands = self._create_roi_hands(complexity)
+        self.model_complexity = complexity
+        self._last_bbox = None
+        self._frames_since_full = 0
+
+    def _next_roi(self, w, h):
+        """根据上一帧包围盒计算本帧裁剪区域，需要整帧检测时返回 None"""
+        if not self.roi_tracking or self._last_bbox is None:
+            return None
+        if self._frames_since_full >= self.redetect_interval:
+            return None
+
+        x0, y0, x1, y1 = self._last_bbox
+        # 以较长边为基准外扩，保证手快速移动时仍在裁剪区域内
+        pad = int(max(x1 - x0, y1 - y0) * self.roi_margin)
+        x0 = max(0, x0 - pad)
+        y0 = max(0, y0 - pad)
+        x1 = min(w, x1 + pad)
+        y1 = min(h, y1 + pad)
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        return x0, y0, x1, y1
+
+    def _detect(self, frame_rgb, roi, max_side=None):
+        """在 roi 区域（None 表示整帧）内运行 MediaPipe，返回整帧像素坐标的手部列表"""
+        if roi is None:
+            x0, y0 = 0, 0
+            region = frame_rgb
+        else:
+            x0, y0, x1, y1 = roi
+            region = frame_rgb[y0:y1, x0:x1]
+        rh, rw = region.shape[:2]
+
+        # 按需缩小后再推理；MediaPipe 输出归一化坐标，缩放不影响映射
+        pooled = None
+        if roi is None and self.inference_size:
+            # 保持宽高比，避免画面被横向/纵向压扁影响关键点精度
+            iw, ih = fit_size(rw, rh, self.inference_size)
+            if (iw, ih) != (rw, rh):
+                if self.pool is not None:
+                    pooled = self.pool.acquire((ih, iw, 3))
+                region = cv2.resize(region, (iw, ih), dst=pooled, interpolation=cv2.INTER_AREA)
+        elif max_side and max(rw, rh) > max_side:
+            scale = max_side / max(rw, rh)
+            region = cv2.resize(region, (max(1, int(rw * scale)), max(1, int(rh * scale))),
+                                interpolation=cv2.INTER_AREA)
+
+        if not region.flags['C_CONTIGUOUS']:
+            # 未缩放的 ROI 切片不连续，只复制裁剪出的小区域
+            region = np.ascontiguousarray(region)
+        try:
+            hands = self.hands if roi is None else self.roi_hands
+            results = hands.process(region)
+        finally:
+            if pooled is not None:
+                self.pool.release(pooled)
+        if not results.multi_hand_landmarks:
+            return []
+
+        # 所有手的关键点一次性换算为整帧像素坐标
+        classifications = [h.classification[0] for h in results.multi_handedness]
+        return hands_from_landmarks(
+            [hand_landmarks.landmark for hand_landmarks in results.multi_hand_landmarks],
+            [c.label for c in classifications], rw, rh, x0, y0,
+            scores=[c.score for c in classifications])
+
+    def _update_bbox(self, hands_out, w, h):
+        """记录所有手的关键点包围盒并集，供下一帧裁剪使用"""
+        bbox = hands_bbox(hands_out)
+        if bbox is None:
+            self._last_bbox = None
+            return
+        x0, y0, x1, y1 = bbox
+        self._last_bbox = (max(0, x0), max(0, y0), min(w, x1), min(h, y1))
 
     def process(self, frame_bgr):
         """
         处理 BGR 帧并返回 (annotated_frame, hands_list)
-        hands_list: 每个手为字典 {'landmarks': [(x_px,y_px,z), ...], 'handedness': 'Left'/'Right'}
+        hands_list: 每只手为一个 Hand（points 为 (21, 3) 像素坐标数组），
+                    兼容原字典格式 {'landmarks': [(x_px,y_px,z), ...], 'handedness': 'Left'/'Right'}
         annotated_frame: 未改变图像或可供可视化的同一帧（BGR）
         """
-        img_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(img_rgb)
-        h, w = frame_bgr.shape[:2]
-        hands_out = []
-
-        if results.multi_hand_landmarks:
-            for hand_landmarks, hand_handedness in zip(results.multi_hand_landmarks, 
-                                                       results.multi_handedness):
-                lm_list = []
-                for lm in hand_landmarks.landmark:
-                    x_px = int(lm.x * w)
-                    y_px = int(lm.y * h)
-                    lm_list.append((x_px, y_px, lm.z))
-                handedness_label = hand_handedness.classification[0].label
-                hands_out.append({'landmarks': lm_list, 'handedness': handedness_label})
-
+        _, hands_out = self.process_rgb(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB))
         return frame_bgr, hands_out
 
+    @timed('hand_tracker')
+    def process_rgb(self, frame_rgb):
+        """与 process 相同，但输入为 RGB 图像，返回 (frame_rgb, hands_list)"""
+        self._apply_pending_complexity()
+        h, w = frame_rgb.shape[:2]
+        roi = self._next_roi(w, h)
+
+        hands_out = None
+        if roi is not None:
+            hands_out = self._detect(frame_rgb, roi, self.roi_max_side)
+            self._frames_since_full += 1
+            if not hands_out:
+                # ROI 内丢失手部：清除 ROI 状态，本帧立即退回整帧检测
+                self._last_bbox = None
+                roi = None
+
+        if roi is None:
+            if self._frames_since_full:
+                # 之前若干帧由 ROI 实例处理，整帧实例的跟踪状态已过时，重新从检测开始
+                self.hands.reset()
+            hands_out = self._detect(frame_rgb, None)
+            self._frames_since_full = 0
+
+        if self.roi_tracking:
+            self._update_bbox(hands_out, w, h)
+
+        return frame_rgb, hands_out
+
     def close(self):
         if self.hands:
             self.hands.close()
+        if self.roi_hands:
+            self.roi_hands.close()
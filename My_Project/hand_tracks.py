@@ -0,0 +1,186 @@
+import time
+from collections import deque
+
+import numpy as np
+
+
+class GestureVote:
+    """
+    手势稳定性投票：保留最近 size 帧的识别结果，用增量计数维护多数手势，
+    每帧 O(1) 更新，不再每帧从历史记录重新统计。
+    规则与原来相同：历史未满时返回 None；某手势占比达到 ratio 时返回该手势，否则返回最新一帧的结果。
+    ratio > 0.5 时达到阈值的手势至多一个，只需检查刚加入的手势和之前的多数手势。
+    """
+    __slots__ = ('size', 'threshold', 'history', 'counts', 'majority')
+
+    def __init__(self, size=3, ratio=0.6):
+        self.size = size
+        self.threshold = size * ratio
+        self.history = deque(maxlen=size)
+        self.counts = {}
+        self.majority = None
+
+    def push(self, gesture):
+        """加入一帧结果，返回当前确认的手势"""
+        counts = self.counts
+        if len(self.history) == self.size:
+            evicted = self.history[0]
+            remaining = counts[evicted] - 1
+            if remaining:
+                counts[evicted] = remaining
+            else:
+                del counts[evicted]
+        self.history.append(gesture)
+        counts[gesture] = counts.get(gesture, 0) + 1
+
+        if counts[gesture] >= self.threshold:
+            self.majority = gesture
+        elif self.majority is not None and counts.get(self.majority, 0) < self.threshold:
+            self.majority = None
+        return self.result()
+
+    def result(self):
+        if len(self.history) < self.size:
+            return None
+        if self.majority is not None:
+            return self.majority
+        return self.history[-1]
+
+    def clear(self):
+        self.history.clear()
+        self.counts.clear()
+        self.majority = None
+
+    def __len__(self):
+        return len(self.history)
+
+
+class DwellState:
+    """
+    停留点击状态（每只手各一份）：
+      start / pos: 按位置停留（GestureLogic.check_dwell_click）的开始时间和位置
+      target: 按目标停留（如主菜单悬停的按钮名），与 start 一起使用
+    """
+    __slots__ = ('start', 'pos', 'target')
+
+    def __init__(self):
+        self.start = None
+        self.pos = None
+        self.target = None
+
+    def reset(self):
+        self.start = None
+        self.pos = None
+        self.target = None
+
+
+class HandTrack:
+    """
+    一只被跟踪的手：跨帧保持不变的 track_id，以及该手自己的时序状态
+      votes: 手势稳定性投票
+      dwell: 停留点击状态
+      filter: 关键点平滑滤波器（由使用方按需创建）
+    """
+    __slots__ = ('track_id', 'handedness', 'wrist', 'hand', 'first_seen', 'last_seen',
+                 'frames', 'votes', 'dwell', 'filter')
+
+    def __init__(self, track_id, hand, timestamp, gesture_stability=3):
+        self.track_id = track_id
+        self.handedness = hand['handedness']
+        self.wrist = _wrist(hand)
+        self.hand = hand
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.frames = 1
+        self.votes = GestureVote(gesture_stability)
+        self.dwell = DwellState()
+        self.filter = None
+
+    def update(self, hand, timestamp):
+        self.handedness = hand['handedness']
+        self.wrist = _wrist(hand)
+        self.hand = hand
+        self.last_seen = timestamp
+        self.frames += 1
+
+    def __repr__(self):
+        return f"HandTrack(#{self.track_id} {self.handedness}, frames={self.frames})"
+
+
+def _wrist(hand):
+    points = getattr(hand, 'points', None)
+    if points is not None:
+        return points[0, :2].astype(np.float64)
+    x, y, _ = hand['landmarks'][0]
+    return np.array([x, y], dtype=np.float64)
+
+
+class HandTrackManager:
+    """
+    跨帧的手部跟踪：给每只手分配稳定的 track_id，并保存各自的手势投票、停留点击和滤波状态，
+    两只手同时出现时互不干扰。
+      - 关联：按手腕距离就近匹配，左右手标签不一致时距离加上 handedness_penalty_px（只作参考，
+        MediaPipe 的左右手标签偶尔会跳变）；距离超过 max_distance_px 的不匹配
+      - 未匹配的手创建新轨迹；超过 timeout 秒未出现的轨迹被移除，并以 track_id 调用 on_expire
+    update() 只应在一个线程中调用（流水线的手势阶段）。
+    """
+    def __init__(self, max_distance_px=200, handedness_penalty_px=80, timeout=0.5, gesture_stability=3,
+                 on_expire=None):
+        self.max_distance_px = max_distance_px
+        self.handedness_penalty_px = handedness_penalty_px
+        self.timeout = timeout
+        self.gesture_stability = gesture_stability
+        self.on_expire = on_expire  # 轨迹移除时的回调（如清理按 track_id 保存的其他状态）
+        self.tracks = {}
+        self._next_id = 1
+
+    def update(self, hands, timestamp=None):
+        """关联本帧的手，返回与 hands 一一对应的 HandTrack 列表"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        # 候选配对按代价从小到大贪心匹配（每帧最多两三只手，贪心即可）
+        candidates = []
+        for j, hand in enumerate(hands):
+            wrist = _wrist(hand)
+            for track in self.tracks.values():
+                cost = float(np.hypot(*(track.wrist - wrist)))
+                if cost > self.max_distance_px:
+                    continue
+                if track.handedness != hand['handedness']:
+                    cost += self.handedness_penalty_px
+                candidates.append((cost, j, track.track_id))
+        candidates.sort(key=lambda c: c[0])
+
+        assigned = [None] * len(hands)
+        used = set()
+        for cost, j, track_id in candidates:
+            if assigned[j] is not None or track_id in used:
+                continue
+            track = self.tracks[track_id]
+            track.update(hands[j], timestamp)
+            assigned[j] = track
+            used.add(track_id)
+
+        for j, hand in enumerate(hands):
+            if assigned[j] is None:
+                track = HandTrack(self._next_id, hand, timestamp, self.gesture_stability)
+                self._next_id += 1
+                self.tracks[track.track_id] = track
+                assigned[j] = track
+            if hasattr(hand, 'track_id'):
+                hand.track_id = assigned[j].track_id
+
+        # 移除超时的轨迹
+        expired = [tid for tid, track in self.tracks.items() if timestamp - track.last_seen > self.timeout]
+        for tid in expired:
+            del self.tracks[tid]
+            if self.on_expire:
+                self.on_expire(tid)
+        return assigned
+
+    def get(self, track_id):
+        return self.tracks.get(track_id)
+
+    def clear(self):
+        self.tracks.clear()
@@ -0,0 +1,198 @@
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from hand import Hand
+
+# 文件格式：16 字节文件头 + 定长记录（小端）
+#   文件头: magic 'ACLM' | version u16 | max_hands u16 | frame_width u32 | frame_height u32
+#   记录:   timestamp f8 | seq u4 | num_hands u4 | hands[max_hands]
+#   每只手: present u1 | handedness u1 (0=Left, 1=Right) | 保留 2 字节 | score f4 | landmarks f4[21][3]
+# 关键点 x、y 为录制时的帧像素坐标，z 为 MediaPipe 相对深度。
+# 记录定长且只追加，文件可直接用 np.memmap 映射；进程中断时末尾不完整的记录会被忽略。
+MAGIC = b'ACLM'
+VERSION = 1
+MAX_HANDS = 2
+HEADER = struct.Struct('<4sHHII')
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+HANDEDNESS_LABELS = {0: 'Left', 1: 'Right'}
+
+HAND_DTYPE = np.dtype([
+    ('present', 'u1'),
+    ('handedness', 'u1'),
+    ('reserved', 'u1', (2,)),
+    ('score', '<f4'),
+    ('landmarks', '<f4', (21, 3)),
+])
+
+
+def record_dtype(max_hands=MAX_HANDS):
+    return np.dtype([
+        ('timestamp', '<f8'),
+        ('seq', '<u4'),
+        ('num_hands', '<u4'),
+        ('hands', HAND_DTYPE, (max_hands,)),
+    ])
+
+
+class LandmarkRecorder:
+    """
+    把每帧 HandTracker 的输出追加写入二进制文件。
+    write() 可在推理线程中调用；文件头在第一次写入时根据帧尺寸生成。
+    """
+    def __init__(self, path, max_hands=MAX_HANDS, flush_every=30):
+        self.path = path
+        self.max_hands = max_hands
+        self.flush_every = flush_every
+        self.dtype = record_dtype(max_hands)
+        self.count = 0
+
+        self._record = np.zeros(1, dtype=self.dtype)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self, width, height):
+        self._file = open(self.path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.max_hands, width, height))
+
+    def write(self, timestamp, seq, hands, frame_size):
+        """
+        追加一帧记录
+        hands: HandTracker 输出的手部列表
+        frame_size: 录制帧的 (宽, 高)
+        """
+        with self._lock:
+            if self._file is None:
+                self._open(*frame_size)
+
+            rec = self._record[0]
+            rec['timestamp'] = timestamp
+            rec['seq'] = seq
+            rec['hands'] = 0
+            n = min(len(hands), self.max_hands)
+            rec['num_hands'] = n
+            for i in range(n):
+                hand = hands[i]
+                slot = rec['hands'][i]
+                slot['present'] = 1
+                slot['handedness'] = HANDEDNESS_CODES.get(hand['handedness'], 1)
+                slot['score'] = hand.get('score', 1.0)
+                slot['landmarks'] = hand.points if isinstance(hand, Hand) else hand['landmarks']
+
+            self._record.tofile(self._file)
+            self.count += 1
+            if self.count % self.flush_every == 0:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class LandmarkReplayer:
+    """
+    回放录制文件，可替代 HandTracker：
+      - process()/process_rgb() 与 HandTracker 接口一致，返回与录制时相同结构的手部列表
+      - speed > 0: 按录制时的时间轴回放（speed=2 表示两倍速），每次调用返回当前时刻对应的记录
+      - speed = 0: 不看时间，每次调用依次返回下一条记录（尽可能快）
+    关键点会按当前帧与录制帧的尺寸比例换算。
+    """
+    def __init__(self, path, speed=1.0, loop=True):
+        with open(path, 'rb') as f:
+            magic, version, max_hands, width, height = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"不是有效的关键点录制文件: {path}")
+        self.path = path
+        self.frame_size = (width, height)
+        self.dtype = record_dtype(max_hands)
+
+        # 忽略末尾不完整的记录
+        count = (os.path.getsize(path) - HEADER.size) // self.dtype.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r',
+                                     offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+        self.speed = speed
+        self.loop = loop
+        self.inference_size = None  # 与 HandTracker 属性保持一致（回放时无意义）
+        self._index = 0
+        self._start_time = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def hands_at(self, index, frame_size=None):
+        """把第 index 条记录转换为手部列表；frame_size 给出时按比例换算到该尺寸"""
+        rec = self.records[index]
+        n = int(rec['num_hands'])
+        if n == 0:
+            return []
+        # 复制出所有手的关键点（memmap 只读），一次性按帧尺寸缩放
+        points = np.array(rec['hands']['landmarks'][:n], dtype=np.float32)
+        if frame_size and self.frame_size[0] and self.frame_size[1]:
+            points[..., 0] *= frame_size[0] / self.frame_size[0]
+            points[..., 1] *= frame_size[1] / self.frame_size[1]
+
+        hands = []
+        for i in range(n):
+            slot = rec['hands'][i]
+            if not slot['present']:
+                continue
+            hands.append(Hand(points[i], HANDEDNESS_LABELS.get(int(slot['handedness']), 'Right'),
+                              float(slot['score'])))
+        return hands
+
+    def __iter__(self):
+        """依次产出 (timestamp, seq, hands)"""
+        for i in range(len(self.records)):
+            rec = self.records[i]
+            yield float(rec['timestamp']), int(rec['seq']), self.hands_at(i)
+
+    def _next_index(self):
+        n = len(self.records)
+        if self.speed <= 0:
+            index = self._index
+            self._index += 1
+        else:
+            now = time.monotonic()
+            if self._start_time is None:
+                self._start_time = now
+            t0 = self.records[0]['timestamp']
+            elapsed = (now - self._start_time) * self.speed
+            index = int(np.searchsorted(self.records['timestamp'], t0 + elapsed, side='right')) - 1
+            index = max(index, 0)
+            if index >= n - 1 and self.loop and elapsed > self.records[-1]['timestamp'] - t0:
+                self._start_time = now  # 时间轴重新开始
+        if index >= n:
+            if not self.loop:
+                return None
+            index %= n
+        return index
+
+    def process(self, frame):
+        """与 HandTracker.process 相同的接口，返回 (frame, hands_list)"""
+        if not len(self.records):
+            return frame, []
+        index = self._next_index()
+        if index is None:
+            return frame, []
+        h, w = frame.shape[:2]
+        return frame, self.hands_at(index, (w, h))
+
+    def process_rgb(self, frame_rgb):
+        return self.process(frame_rgb)
+
+    def set_model_complexity(self, complexity):
+        pass
+
+    def close(self):
+        # memmap 随对象释放
+        self.records = np.zeros(0, dtype=self.dtype)
@@ -0,0 +1,100 @@
+import bisect
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class LandmarkTimeline:
+    """
+    关键点时间序列：按 key（通常是 HandTrack 的 track_id）保存最近几次推理结果及其采集时间戳，
+    回答“第 k 个关键点在 t 时刻的位置”，使应用的游戏节拍（60Hz）与推理频率（15~30Hz）解耦。
+      - t 落在两次推理之间：线性插值
+      - t 晚于最新一次推理：按最近两次结果的速度匀速外推，外推时长不超过 max_horizon 秒
+      - t 早于最早的样本：返回最早的样本
+      - 最新样本超过 max_age 秒的 key 视为已丢失，返回 None
+    add() 在流水线工作线程中调用，query() 在GUI线程中调用，内部用锁保护。
+    """
+    def __init__(self, capacity=8, max_horizon=0.1, max_age=0.5):
+        self.capacity = capacity
+        self.max_horizon = max_horizon
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._times = {}    # key -> deque[timestamp]
+        self._points = {}   # key -> deque[(21, 3) float64]
+
+    def add(self, key, timestamp, points):
+        """加入 key 在 timestamp 秒（time.monotonic 时钟）时刻的关键点"""
+        points = np.array(points, dtype=np.float64)
+        with self._lock:
+            times = self._times.get(key)
+            if times is None:
+                times = self._times[key] = deque(maxlen=self.capacity)
+                self._points[key] = deque(maxlen=self.capacity)
+            if times and timestamp <= times[-1]:
+                # 时间戳不递增的样本（乱序到达等）忽略；跳帧的包不会送到这里，见 FramePacket.skipped
+                return
+            times.append(timestamp)
+            self._points[key].append(points)
+
+    def add_hands(self, hands, timestamp):
+        """按 track_id 加入一帧中所有被跟踪的手，并移除长时间没有更新的 key"""
+        for hand in hands:
+            if hand.track_id is not None:
+                self.add(hand.track_id, timestamp, hand.points)
+        self.expire(timestamp)
+
+    def expire(self, now):
+        with self._lock:
+            stale = [key for key, times in self._times.items() if now - times[-1] > self.max_age]
+            for key in stale:
+                del self._times[key]
+                del self._points[key]
+
+    def latest_time(self, key):
+        with self._lock:
+            times = self._times.get(key)
+            return times[-1] if times else None
+
+    def recent(self, key, n):
+        """key 最近 n 个样本的 (时间戳列表, 关键点数组列表)，按时间先后排列；已丢失时返回空列表"""
+        with self._lock:
+            times = self._times.get(key)
+            if not times:
+                return [], []
+            return list(times)[-n:], list(self._points[key])[-n:]
+
+    def query(self, key, t, landmark=None):
+        """
+        返回 key 在 t 时刻的关键点估计：landmark 为 None 时返回 (21, 3) 数组，
+        否则返回该关键点的 (x, y, z)；没有数据或已丢失时返回 None
+        """
+        with self._lock:
+            times = self._times.get(key)
+            if not times or t - times[-1] > self.max_age:
+                return None
+            times = list(times)
+            points = list(self._points[key])
+
+        rows = slice(None) if landmark is None else landmark
+        i = bisect.bisect_right(times, t)
+        if i == 0:
+            return points[0][rows].copy()
+        if i < len(times):
+            # 插值
+            t0, t1 = times[i - 1], times[i]
+            p0, p1 = points[i - 1][rows], points[i][rows]
+            return p0 + (p1 - p0) * ((t - t0) / (t1 - t0))
+
+        # 外推：最新样本之后按匀速运动估计，时长受 max_horizon 限制
+        p1 = points[-1][rows]
+        if len(times) < 2:
+            return p1.copy()
+        t0, t1 = times[-2], times[-1]
+        velocity = (p1 - points[-2][rows]) / (t1 - t0)
+        return p1 + velocity * min(t - t1, self.max_horizon)
+
+    def clear(self):
+        with self._lock:
+            self._times.clear()
+            self._points.clear()
@@ -1,17 +1,33 @@
 import sys
+import time
+import argparse
 import cv2
 import math
 import os
+import numpy as np
 from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtCore import pyqtSlot
 
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
 from mediapipe import solutions
 from mediapipe.framework.formats import landmark_pb2
 
+from capture import CaptureThread
+from frame_source import add_source_arguments
 from hand_tracker import HandTracker
+from gesture_recognizer import find_model_path, RecognizerTracker, AsyncGestureRecognizer
+from pipeline import FramePipeline, FramePublisher, DROP_OLDEST
+from quality_governor import QualityGovernor, scaled_levels
+from frame_pool import FramePool
+from metrics import METRICS, timed
+from tracing import TRACER, traced
+from watchdog import StallWatchdog
+from landmark_recorder import LandmarkRecorder, LandmarkReplayer
+from hand_tracks import HandTrackManager
+from one_euro import LandmarkSmoother
+from landmark_timeline import LandmarkTimeline
+from cursor_predictor import CursorPredictor
+from gesture_events import GestureEventBus, GestureEventTracker, PINCH_START
+from frame_context import FrameContext
 from gesture_logic import GestureLogic  # 使用提供的GestureLogic类
 from apps.drawing_board import DrawingBoard
 from apps.paddle_game import PaddleGame
@@ -22,12 +38,74 @@ from apps.vr_pvp_mode import VRPVPMode
 # 初始化MediaPipe手部解决方案
 mp_hands = solutions.hands
 
+# 非主菜单界面绘制的手指连线：每根手指从手腕(0)到指尖的关键点序号
+FINGER_CHAINS = [
+    [0, 1, 2, 3, 4],  # 拇指
+    [0, 5, 6, 7, 8],  # 食指
+    [0, 9, 10, 11, 12],  # 中指
+    [0, 13, 14, 15, 16],  # 无名指
+    [0, 17, 18, 19, 20],  # 小指
+]
+
+
+def _to_rgb_style(style):
+    """MediaPipe 默认绘制样式的颜色按BGR定义，转换为在RGB帧上绘制时使用的样式"""
+    return {
+        key: solutions.drawing_utils.DrawingSpec(
+            color=tuple(reversed(spec.color)),
+            thickness=spec.thickness,
+            circle_radius=spec.circle_radius)
+        for key, spec in style.items()
+    }
+
+
+def parse_size(text):
+    """命令行的 'WxH' 尺寸参数，如 640x360"""
+    try:
+        w, h = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"尺寸格式应为 WxH，如 640x360: {text}")
+    if w <= 0 or h <= 0:
+        raise argparse.ArgumentTypeError(f"尺寸必须为正数: {text}")
+    return w, h
+
 class CameraLabel(QtWidgets.QLabel):
-    """保持不变，用于显示摄像头画面和UI元素"""
+    """
+    显示摄像头画面和主菜单UI：
+      - 按钮的静态外观（渐变、边框、文字）按状态预先渲染为 QPixmap，绘制时只需贴图；
+        按钮半径变化或窗口尺寸变化时缓存失效
+      - 光标、悬停进度弧、手势标签等动态内容每次直接叠加绘制
+      - 各项状态变化只记录脏区域，由 flush_updates() 每帧合并为一次 update()；
+        摄像头新帧会使整个控件失效
+    """
+    BUTTON_COLORS = {
+        'normal': QtGui.QColor(60, 60, 60, 200),
+        'hover': QtGui.QColor(100, 100, 255, 220),
+        'clicked': QtGui.QColor(0, 200, 0, 255),
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setScaledContents(True)
-        self.cursor_pos = None
+        self._dirty_region = QtGui.QRegion()
+        self._dirty_all = True
+        self._button_pixmaps = {}  # (状态, 名称) -> QPixmap
+
+        # 绘制用的字体和画笔只创建一次
+        self._button_font = QtGui.QFont('Arial', 14, QtGui.QFont.Bold)
+        self._label_font = QtGui.QFont('Arial', 12, QtGui.QFont.Bold)
+        self._status_font = QtGui.QFont('Arial', 11)
+        self._metrics_font = QtGui.QFont('Courier New', 10)
+        self._white_pen = QtGui.QPen(QtGui.QColor(255, 255, 255))
+        self._cursor_pen = QtGui.QPen(QtGui.QColor('white'), 2)
+        self._cursor_brush = QtGui.QColor(0, 120, 255, 180)
+        self._arc_pen = QtGui.QPen(QtGui.QColor(255, 255, 0), 5)
+        self._overlay_brush = QtGui.QColor(0, 0, 0, 150)
+        self._metrics_pen = QtGui.QPen(QtGui.QColor(0, 255, 0))
+        self._pinch_label_color = QtGui.QColor(0, 0, 0, 180)
+        self._official_label_color = QtGui.QColor(0, 0, 255, 180)
+
+        self._cursor_pos = None
         self.show_cursor = True
         self.show_buttons = True
 
@@ -41,11 +119,127 @@ class CameraLabel(QtWidgets.QLabel):
             'Clear': QtCore.QPoint(0, 0)
         }
 
-        self.hover_button = None
-        self.hover_progress = 0.0
-        self.clicked_button = None
+        self._hover_button = None
+        self._hover_progress = 0.0
+        self._clicked_button = None
         self.hand_gestures = []  # 存储手势信息用于显示
         self.official_gestures = []  # 存储官方模型识别的手势
+        self._status_text = None  # 左上角状态信息（如质量调节决策）
+        self._metrics_lines = None  # 各阶段耗时统计叠加层（None 表示不显示）
+        self.frame_image = None  # 当前摄像头帧（QImage，直接引用共享的RGB缓冲区）
+        self._frame_ref = None  # 持有numpy缓冲区引用，保证QImage数据有效
+
+    # 重绘请求合并
+    def _mark(self, rect):
+        if rect is not None:
+            self._dirty_region = self._dirty_region.united(rect)
+
+    def invalidate(self):
+        """整个控件需要重绘"""
+        self._dirty_all = True
+
+    def flush_updates(self):
+        """把累积的重绘请求合并为一次 update()，只重绘脏区域；每帧调用一次"""
+        if self._dirty_all:
+            self.update()
+        elif not self._dirty_region.isEmpty():
+            self.update(self._dirty_region)
+        self._dirty_all = False
+        self._dirty_region = QtGui.QRegion()
+
+    def _button_rect(self, name):
+        """按钮及其悬停进度弧占据的区域"""
+        if name is None or name not in self.buttons:
+            return None
+        center = self.buttons[name]
+        r = self.button_radius + 10
+        return QtCore.QRect(center.x() - r, center.y() - r, r * 2, r * 2)
+
+    @staticmethod
+    def _cursor_rect(pos):
+        if pos is None:
+            return None
+        x, y = pos
+        return QtCore.QRect(x - 14, y - 14, 28, 28)
+
+    # 状态属性：赋值时记录受影响的区域
+    @property
+    def cursor_pos(self):
+        return self._cursor_pos
+
+    @cursor_pos.setter
+    def cursor_pos(self, pos):
+        if pos != self._cursor_pos:
+            self._mark(self._cursor_rect(self._cursor_pos))
+            self._mark(self._cursor_rect(pos))
+            self._cursor_pos = pos
+
+    @property
+    def hover_button(self):
+        return self._hover_button
+
+    @hover_button.setter
+    def hover_button(self, name):
+        if name != self._hover_button:
+            self._mark(self._button_rect(self._hover_button))
+            self._mark(self._button_rect(name))
+            self._hover_button = name
+
+    @property
+    def hover_progress(self):
+        return self._hover_progress
+
+    @hover_progress.setter
+    def hover_progress(self, progress):
+        if progress != self._hover_progress:
+            self._mark(self._button_rect(self._hover_button))
+            self._hover_progress = progress
+
+    @property
+    def clicked_button(self):
+        return self._clicked_button
+
+    @clicked_button.setter
+    def clicked_button(self, name):
+        if name != self._clicked_button:
+            self._mark(self._button_rect(self._clicked_button))
+            self._mark(self._button_rect(name))
+            self._clicked_button = name
+
+    @property
+    def status_text(self):
+        return self._status_text
+
+    @status_text.setter
+    def status_text(self, text):
+        if text != self._status_text:
+            self._mark(self._status_rect(self._status_text))
+            self._mark(self._status_rect(text))
+            self._status_text = text
+
+    @property
+    def metrics_lines(self):
+        return self._metrics_lines
+
+    @metrics_lines.setter
+    def metrics_lines(self, lines):
+        if lines != self._metrics_lines:
+            self._mark(self._metrics_rect(self._metrics_lines))
+            self._mark(self._metrics_rect(lines))
+            self._metrics_lines = lines
+
+    @staticmethod
+    def _status_rect(text):
+        if not text:
+            return None
+        return QtCore.QRect(10, 10, len(text) * 9 + 20, 28)
+
+    @staticmethod
+    def _metrics_rect(lines):
+        if not lines:
+            return None
+        width = max(len(line) for line in lines) * 8 + 20
+        return QtCore.QRect(10, 48, width, len(lines) * 18 + 12)
 
     def update_button_positions(self):
         center_x = self.width() // 2
@@ -54,61 +248,49 @@ class CameraLabel(QtWidgets.QLabel):
         for name in self.buttons.keys():
             self.buttons[name] = QtCore.QPoint(center_x + offset, center_y)
             offset += self.button_spacing
+        self.invalidate()
 
-    def set_hand_gestures(self, gestures):
-        self.hand_gestures = gestures
-        self.update()
+    def resizeEvent(self, event):
+        # 尺寸变化时按钮缓存失效，下次绘制时重新渲染
+        self._button_pixmaps.clear()
+        self.invalidate()
+        super().resizeEvent(event)
 
-    def set_official_gestures(self, gestures):
-        self.official_gestures = gestures
-        self.update()
+    def _button_pixmap(self, name, state):
+        """按钮静态外观的缓存贴图，以按钮中心为贴图中心"""
+        key = (state, name, self.button_radius)
+        pixmap = self._button_pixmaps.get(key)
+        if pixmap is not None:
+            return pixmap
+        r = self.button_radius
+        size = (r + 4) * 2
+        pixmap = QtGui.QPixmap(size, size)
+        pixmap.fill(QtCore.Qt.transparent)
+        center = QtCore.QPoint(size // 2, size // 2)
+        base_color = self.BUTTON_COLORS[state]
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QtGui.QPainter(self)
+        p = QtGui.QPainter(pixmap)
+        grad = QtGui.QRadialGradient(center, r)
+        grad.setColorAt(0, base_color.lighter(150))
+        grad.setColorAt(1, base_color.darker(150))
+        p.setBrush(QtGui.QBrush(grad))
+        p.setPen(QtGui.QPen(QtGui.QColor("white"), 3))
+        p.drawEllipse(center, r, r)
+        p.setFont(self._button_font)
+        p.setPen(self._white_pen)
+        p.drawText(QtCore.QRect(center.x() - r, center.y() - r, r * 2, r * 2), QtCore.Qt.AlignCenter, name)
+        p.end()
 
-        if self.show_buttons:
-            for name, center in self.buttons.items():
-                base_color = QtGui.QColor(60, 60, 60, 200)
-                if name == self.hover_button:
-                    base_color = QtGui.QColor(100, 100, 255, 220)
-                if name == self.clicked_button:
-                    base_color = QtGui.QColor(0, 200, 0, 255)
-
-                grad = QtGui.QRadialGradient(center, self.button_radius)
-                grad.setColorAt(0, base_color.lighter(150))
-                grad.setColorAt(1, base_color.darker(150))
-                painter.setBrush(QtGui.QBrush(grad))
-                painter.setPen(QtGui.QPen(QtGui.QColor("white"), 3))
-                painter.drawEllipse(center, self.button_radius, self.button_radius)
-
-                painter.setFont(QtGui.QFont('Arial', 14, QtGui.QFont.Bold))
-                painter.setPen(QtGui.QPen(QtGui.QColor("white")))
-                text_rect = QtCore.QRect(
-                    center.x() - self.button_radius,
-                    center.y() - self.button_radius,
-                    self.button_radius * 2,
-                    self.button_radius * 2
-                )
-                painter.drawText(text_rect, QtCore.Qt.AlignCenter, name)
-
-                if name == self.hover_button and self.hover_progress > 0:
-                    pen = QtGui.QPen(QtGui.QColor(255, 255, 0), 5)
-                    painter.setPen(pen)
-                    painter.setBrush(QtCore.Qt.NoBrush)
-                    start_angle = 90 * 16
-                    span_angle = int(-self.hover_progress * 360 * 16)
-                    painter.drawArc(center.x() - self.button_radius - 6,
-                                    center.y() - self.button_radius - 6,
-                                    (self.button_radius + 6) * 2,
-                                    (self.button_radius + 6) * 2,
-                                    start_angle, span_angle)
+        self._button_pixmaps[key] = pixmap
+        return pixmap
 
-        # 合并后的手势标签显示逻辑
-        for i in range(max(len(self.hand_gestures), len(self.official_gestures))):
+    def _gesture_labels(self, hand_gestures, official_gestures):
+        """合并后的手势标签：[(x, y, 文字, 背景色)]"""
+        labels = []
+        for i in range(max(len(hand_gestures), len(official_gestures))):
             # 获取对应索引的手势数据（处理左右手可能数量不同的情况）
-            hand_gesture = self.hand_gestures[i] if i < len(self.hand_gestures) else None
-            official_gesture = self.official_gestures[i] if i < len(self.official_gestures) else None
+            hand_gesture = hand_gestures[i] if i < len(hand_gestures) else None
+            official_gesture = official_gestures[i] if i < len(official_gestures) else None
             
             # 确定基础位置（优先使用原有手势位置，无则使用官方手势位置）
             if hand_gesture:
@@ -125,34 +307,114 @@ class CameraLabel(QtWidgets.QLabel):
             if is_pinch:
                 # 显示原有pinch标签（黑色背景）
                 gesture_text = hand_gesture[2].replace("_", " ")
-                bg_color = QtGui.QColor(0, 0, 0, 180)
-                rect_y = y - 25
-                text_y = y
+                bg_color = self._pinch_label_color
             else:
                 # 显示官方模型识别结果（蓝色背景）
                 if official_gesture:
                     gesture_text = official_gesture[2].replace("_", " ")
                 else:
                     gesture_text = "unknown"  # 无官方结果时显示unknown
-                bg_color = QtGui.QColor(0, 0, 255, 180)
-                rect_y = y - 25  # 保持原有显示位置
-                text_y = y
-            
+                bg_color = self._official_label_color
+            labels.append((x, y, gesture_text, bg_color))
+        return labels
+
+    def _mark_labels(self, hand_gestures, official_gestures):
+        for x, y, text, _ in self._gesture_labels(hand_gestures, official_gestures):
+            self._mark(QtCore.QRect(x - 10, y - 25, len(text) * 15 + 20, 35))
+
+    def set_hand_gestures(self, gestures):
+        if gestures != self.hand_gestures:
+            self._mark_labels(self.hand_gestures, self.official_gestures)
+            self.hand_gestures = gestures
+            self._mark_labels(self.hand_gestures, self.official_gestures)
+
+    def set_official_gestures(self, gestures):
+        if gestures != self.official_gestures:
+            self._mark_labels(self.hand_gestures, self.official_gestures)
+            self.official_gestures = gestures
+            self._mark_labels(self.hand_gestures, self.official_gestures)
+
+    def set_frame(self, frame_rgb):
+        """设置摄像头帧：直接包装RGB缓冲区为QImage，不复制、不生成QPixmap"""
+        h, w = frame_rgb.shape[:2]
+        self._frame_ref = frame_rgb
+        self.frame_image = QtGui.QImage(frame_rgb.data, w, h, 3 * w, QtGui.QImage.Format_RGB888)
+        self.invalidate()
+
+    @traced('paint')
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        painter = QtGui.QPainter(self)
+
+        # 摄像头画面拉伸铺满控件（与手势坐标的映射方式一致）；局部重绘时只缩放脏区域对应的部分
+        if self.frame_image is not None:
+            dirty = event.rect()
+            if dirty == self.rect():
+                painter.drawImage(self.rect(), self.frame_image)
+            else:
+                sx = self.frame_image.width() / self.width()
+                sy = self.frame_image.height() / self.height()
+                source = QtCore.QRectF(dirty.x() * sx, dirty.y() * sy, dirty.width() * sx, dirty.height() * sy)
+                painter.drawImage(QtCore.QRectF(dirty), self.frame_image, source)
+
+        if self.show_buttons:
+            for name, center in self.buttons.items():
+                state = 'normal'
+                if name == self.hover_button:
+                    state = 'hover'
+                if name == self.clicked_button:
+                    state = 'clicked'
+                pixmap = self._button_pixmap(name, state)
+                painter.drawPixmap(center.x() - pixmap.width() // 2, center.y() - pixmap.height() // 2, pixmap)
+
+            # 悬停进度弧
+            if self.hover_button in self.buttons and self.hover_progress > 0:
+                center = self.buttons[self.hover_button]
+                painter.setPen(self._arc_pen)
+                painter.setBrush(QtCore.Qt.NoBrush)
+                start_angle = 90 * 16
+                span_angle = int(-self.hover_progress * 360 * 16)
+                painter.drawArc(center.x() - self.button_radius - 6,
+                                center.y() - self.button_radius - 6,
+                                (self.button_radius + 6) * 2,
+                                (self.button_radius + 6) * 2,
+                                start_angle, span_angle)
+
+        # 合并后的手势标签显示逻辑
+        painter.setFont(self._label_font)
+        for x, y, gesture_text, bg_color in self._gesture_labels(self.hand_gestures, self.official_gestures):
             # 绘制背景
             painter.setBrush(bg_color)
             painter.setPen(QtCore.Qt.NoPen)
             text_width = len(gesture_text) * 15
-            painter.drawRoundedRect(x - 10, rect_y, text_width + 20, 35, 8, 8)
+            painter.drawRoundedRect(x - 10, y - 25, text_width + 20, 35, 8, 8)
             
             # 绘制文本
-            painter.setFont(QtGui.QFont('Arial', 12, QtGui.QFont.Bold))
-            painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255)))
-            painter.drawText(x, text_y, gesture_text)
+            painter.setPen(self._white_pen)
+            painter.drawText(x, y, gesture_text)
+
+
+        if self.status_text:
+            painter.setFont(self._status_font)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(self._overlay_brush)
+            painter.drawRect(self._status_rect(self.status_text))
+            painter.setPen(self._white_pen)
+            painter.drawText(20, 30, self.status_text)
 
+        if self.metrics_lines:
+            painter.setFont(self._metrics_font)
+            line_height = 18
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(self._overlay_brush)
+            painter.drawRect(self._metrics_rect(self.metrics_lines))
+            painter.setPen(self._metrics_pen)
+            for i, line in enumerate(self.metrics_lines):
+                painter.drawText(20, 66 + i * line_height, line)
 
         if self.show_cursor and self.cursor_pos is not None:
-            painter.setBrush(QtGui.QColor(0, 120, 255, 180))
-            painter.setPen(QtGui.QPen(QtGui.QColor('white'), 2))
+            painter.setBrush(self._cursor_brush)
+            painter.setPen(self._cursor_pen)
             x, y = self.cursor_pos
             painter.drawEllipse(x - 12, y - 12, 24, 24)
 
@@ -160,21 +422,94 @@ class CameraLabel(QtWidgets.QLabel):
 
 
 class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+    def __init__(self, source='camera:0', realtime=True,
+                 queue_size=2, drop_policy=DROP_OLDEST, single_inference=True,
+                 roi_tracking=False, inference_size=(640, 360), latency_budget_ms=50,
+                 record_path=None, replay_path=None, replay_speed=1.0, autostart=True,
+                 metrics_enabled=False, metrics_export=None, metrics_interval=10.0,
+                 trace=False, trace_dir='traces', trace_seconds=10.0,
+                 watchdog_ms=1000, watchdog_log='logs/stall.log',
+                 smoothing=True, smooth_min_cutoff=1.0, smooth_beta=0.01,
+                 timeline_horizon_ms=100, timeline_delay_ms=0, cursor_prediction=True):
         super().__init__()
         self.setWindowTitle("AirCtrl - Gesture Interaction")
         self.showFullScreen()
 
-        # 初始化手势分类器
-        self._init_gesture_classifier()
+        # 单次推理模式：主菜单下只运行官方手势模型，同时得到关键点和手势类别
+        self.single_inference = single_inference
+        # 推理分辨率（与摄像头显示分辨率解耦），关键点会换算回显示帧坐标
+        self.inference_size = inference_size
+
+        # 自适应质量调节：按延迟预算自动调整推理分辨率、模型复杂度、官方模型开关和跳帧
+        # latency_budget_ms=None 时关闭，始终使用固定配置
+        self.governor = None
+        if latency_budget_ms is not None:
+            # 最高档使用调用方配置的推理分辨率，较低档位按比例缩小
+            self.governor = QualityGovernor(budget_ms=latency_budget_ms,
+                                            levels=scaled_levels(inference_size),
+                                            on_change=self._apply_quality_level)
+            self.inference_size = self.governor.level['inference_size']
+        # 上一个未跳帧的手势阶段结果 (hands, tracks, hand_gestures, gestures)，跳帧时原样沿用
+        self._last_gesture_result = ([], [], None, [])
+
+        # 帧缓冲池：大小与同时在途的帧数相当（各阶段队列 + 各阶段正在处理 + 发布槽 + 显示中）
+        self.frame_pool = FramePool(buffers_per_shape=queue_size * 3 + 7)
+        self._displayed_packet = None
 
-        # 摄像头初始化
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW if sys.platform.startswith('win') else 0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+        # 在共享RGB帧上绘制关键点使用的样式（预先转换一次）
+        self._landmark_style = _to_rgb_style(solutions.drawing_styles.get_default_hand_landmarks_style())
+        self._connection_style = _to_rgb_style(solutions.drawing_styles.get_default_hand_connections_style())
+
+        # 关键点录制/回放：回放时用录制文件代替 MediaPipe 推理，便于复现和性能测试
+        self.recorder = LandmarkRecorder(record_path) if record_path else None
+        self.replayer = LandmarkReplayer(replay_path, speed=replay_speed) if replay_path else None
+
+        # 初始化手势分类器（回放时不加载模型）
+        if self.replayer:
+            self.gesture_recognizer = None
+            self.recognizer_tracker = None
+        else:
+            self._init_gesture_classifier()
+
+        # 帧处理流水线：采集 → 推理 → 手势 → 发布到UI，各阶段在独立线程中运行
+        # 被丢弃或被覆盖的帧立即把缓冲区归还给缓冲池
+        self.publisher = FramePublisher(on_discard=lambda p: self._drop_packet(p, 'discarded_results'))
+        self.pipeline = FramePipeline(queue_size=queue_size, policy=drop_policy,
+                                      on_drop=lambda p: self._drop_packet(p, 'dropped_frames'))
+        self.pipeline.add_stage('inference', self._stage_inference)
+        self.pipeline.add_stage('gesture', self._stage_gesture)
+        self.pipeline.add_stage('publish', self.publisher.publish)
+
+        # 摄像头初始化（在独立线程中采集，只保留最新一帧，并直接送入流水线）
+        self.capture = CaptureThread(source=source, width=1280, height=720, realtime=realtime,
+                                     sink=self.pipeline.submit, pool=self.frame_pool)
+        self._last_seq = 0
 
         # 手势跟踪器 - 适配新的GestureLogic参数
-        self.tracker = HandTracker(max_num_hands=2, min_detection_confidence=0.6, min_tracking_confidence=0.6)
+        # roi_tracking=True 时只在上一帧手部附近的裁剪区域内推理（适合单人桌面场景）
+        if self.replayer:
+            self.tracker = self.replayer
+        else:
+            self.tracker = HandTracker(max_num_hands=2, min_detection_confidence=0.6, min_tracking_confidence=0.6,
+                                       roi_tracking=roi_tracking, inference_size=self.inference_size,
+                                       pool=self.frame_pool)
+        # 跨帧手部轨迹：每只手有稳定编号和各自的手势投票、停留点击状态，超过0.5秒未出现即移除
+        self.hand_tracks = HandTrackManager(max_distance_px=200, timeout=0.5, gesture_stability=3,
+                                            on_expire=self._on_track_expired)
+        # 关键点平滑：对每条轨迹的21个关键点做 One Euro 滤波，去除静止抖动而不增加移动延迟
+        self.smoother = LandmarkSmoother(smooth_min_cutoff, smooth_beta) if smoothing else None
+        # 关键点时间序列：游戏类应用按自己的节拍查询插值/外推后的手部位置，不必等待推理结果
+        # timeline_delay_ms > 0 时查询稍早的时刻，以插值为主（更平滑、略增延迟）
+        self.landmark_timeline = LandmarkTimeline(max_horizon=timeline_horizon_ms / 1000)
+        self.timeline_delay = timeline_delay_ms / 1000
+        self._hand_roles = {}  # 'primary' / 'Left' / 'Right' -> 当前帧对应的 track_id
+        self.frame_context = None  # 最近渲染的一帧的 FrameContext
+        # 延迟补偿：按实测的端到端延迟和手的速度、加速度，把食指尖、手腕位置外推到预计显示时刻
+        self.cursor_predictor = CursorPredictor(self.landmark_timeline) if cursor_prediction else None
+        # 手势事件总线：捏合开始/结束、手势变化、手丢失、光标移动只在状态变化时通知订阅者
+        self.gesture_events = GestureEventBus()
+        self.gesture_event_tracker = GestureEventTracker(self.gesture_events)
+        self.gesture_events.subscribe(PINCH_START, self._on_pinch_start)
         self.glogic = GestureLogic(
             pinch_threshold_px=40,        # 保留pinch阈值参数
             dwell_time=0.8,               # 停留时间参数
@@ -212,60 +547,85 @@ class MainWindow(QtWidgets.QMainWindow):
             'Clear': self._clear_drawing
         }
 
-        self.last_hover_name = None
-        self.hover_start_time = QtCore.QTime.currentTime()
+        # 各阶段耗时统计（按 M 键随时开关），可定期导出为 Prometheus 文本格式或 JSON
+        METRICS.enabled = metrics_enabled
+        self.metrics_export = metrics_export
+        self._metrics_hud_time = 0.0
+        if metrics_export:
+            self.metrics_timer = QtCore.QTimer(self)
+            self.metrics_timer.timeout.connect(self._export_metrics)
+            self.metrics_timer.start(int(metrics_interval * 1000))
 
-        # 主定时器
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self._update)
-        self.timer.start(30)
+        # 帧时间线追踪：环形缓冲区只保留最近的事件，按 T 键导出最近 trace_seconds 秒
+        TRACER.enabled = trace
+        TRACER.window_s = trace_seconds
+        self.trace_dir = trace_dir
+
+        # 卡顿看门狗：GUI 事件循环超过 watchdog_ms 没有响应时把主线程调用栈写入滚动日志（None/0 关闭）
+        # 心跳由GUI线程的定时器发出，与是否有新帧无关：摄像头停顿不算卡顿，事件循环被阻塞才算
+        self.watchdog = None
+        self.watchdog_timer = None
+        self._update_started = None   # 正在执行的 _update 的开始时间（perf_counter），空闲时为 None
+        self._last_update_ms = None   # 最近一次完成的 _update 耗时（毫秒）
+        if watchdog_ms:
+            self.watchdog = StallWatchdog(threshold_ms=watchdog_ms, log_path=watchdog_log,
+                                          context=self._watchdog_context)
+            self.watchdog_timer = QtCore.QTimer(self)
+            self.watchdog_timer.setInterval(max(1, watchdog_ms // 4))
+            self.watchdog_timer.timeout.connect(self.watchdog.heartbeat)
+
+        # 流水线每发布一帧结果就通知GUI刷新（取代原来的30ms轮询定时器）
+        self.publisher.result_ready.connect(self._on_frame_ready)
+        self.capture.capture_error.connect(lambda msg: print(msg))
+        # autostart=False 时不启动采集和流水线线程，由调用方逐帧驱动各阶段（如 benchmark.py）
+        if autostart:
+            self.pipeline.start()
+            self.capture.start()
+            if self.watchdog:
+                self.watchdog.start()
+                self.watchdog_timer.start()
 
     def _init_gesture_classifier(self):
         """初始化手势分类模型"""
         self.gesture_recognizer = None
+        self.recognizer_tracker = None  # 单次推理模式下替代 HandTracker + GestureRecognizer
+        model_path = find_model_path()
+        if model_path is None:
+            print("模型文件不存在，将仅使用基础手势识别")
+            return
         try:
-            model_path = r"C:\Users\Hui\Documents\GitHub\AirCtrl2\My_Project\resource\gesture_recognizer.task"
-            if os.path.exists(model_path):
-                base_options = python.BaseOptions(model_asset_path=model_path)
-                options = vision.GestureRecognizerOptions(base_options=base_options)
-                self.gesture_recognizer = vision.GestureRecognizer.create_from_options(options)
-                print(f"成功加载手势识别模型: {model_path}")
+            if self.single_inference:
+                self.recognizer_tracker = RecognizerTracker(
+                    model_path, max_num_hands=2,
+                    min_detection_confidence=0.6, min_tracking_confidence=0.6,
+                    inference_size=self.inference_size, pool=self.frame_pool)
             else:
-                print(f"模型文件不存在: {model_path}，将仅使用基础手势识别")
+                # 异步识别：结果通过信号回到主线程，刷新HUD标签
+                self.gesture_recognizer = AsyncGestureRecognizer(model_path, num_hands=2, max_age_ms=200)
+                self.gesture_recognizer.result_ready.connect(self._on_official_gestures)
+            print(f"成功加载手势识别模型: {model_path}")
         except Exception as e:
             print(f"初始化手势分类器失败: {e}，将仅使用基础手势识别")
 
-    def _process_frame_with_recognizer(self, frame):
-        """使用官方模型处理帧并返回手势识别结果"""
+    def _process_frame_with_recognizer(self, frame, timestamp_ms):
+        """把帧异步提交给官方模型（LIVE_STREAM模式），立即返回不等待结果"""
         if not self.gesture_recognizer:
-            return []
+            return
             
         try:
-            # 转换为MediaPipe格式
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
-            
-            # 识别手势
-            result = self.gesture_recognizer.recognize(mp_image)
-            
-            # 处理结果
-            gestures = []
-            if result.gestures:
-                for gesture in result.gestures:
-                    # 获取最可能的手势
-                    top_gesture = max(gesture, key=lambda g: g.score)
-                    if top_gesture.score > 0.5:  # 过滤低置信度结果
-                        # 获取手部 landmarks 用于定位显示
-                        if result.hand_landmarks:
-                            hand_landmarks = result.hand_landmarks[0]
-                            # 使用手腕位置作为显示位置
-                            wrist_x = hand_landmarks[0].x * frame.shape[1]
-                            wrist_y = hand_landmarks[0].y * frame.shape[0]
-                            gestures.append((wrist_x, wrist_y, top_gesture.category_name))
-            
-            return gestures
+            self.gesture_recognizer.submit(frame, timestamp_ms)
         except Exception as e:
             print(f"模型识别出错: {e}")
-            return []
+
+    @pyqtSlot(object)
+    def _on_official_gestures(self, gestures):
+        """官方模型异步结果回到主线程：菜单界面立即显示最新完成的结果"""
+        ctx = self.frame_context
+        if self.current_mode != "menu" or ctx is None:
+            return
+        mapped = [ctx.to_widget((x, y), self.cam_label) + (gesture,) for (x, y, gesture) in gestures]
+        self.cam_label.set_official_gestures(mapped)
+        self.cam_label.flush_updates()
 
     def resizeEvent(self, event):
         if hasattr(self, "cam_label") and self.cam_label is not None:
@@ -273,16 +633,36 @@ class MainWindow(QtWidgets.QMainWindow):
         super().resizeEvent(event)
 
     def closeEvent(self, event):
-        self.timer.stop()
-        if self.cap:
-            self.cap.release()
+        if self.watchdog:
+            self.watchdog_timer.stop()
+            self.watchdog.stop()
+        if self.capture:
+            self.capture.stop()
+        if self.pipeline:
+            self.pipeline.stop()
+        print(f"帧缓冲池统计: {self.frame_pool.stats()}")
         if self.tracker:
             self.tracker.close()
+        if self.recognizer_tracker:
+            self.recognizer_tracker.close()
+        if self.gesture_recognizer:
+            self.gesture_recognizer.close()
+        if self.recorder:
+            self.recorder.close()
+            print(f"已录制 {self.recorder.count} 帧关键点: {self.recorder.path}")
+        self._export_metrics()
         self._cleanup_apps()
         event.accept()
 
+    def _disconnect_app_events(self):
+        """取消所有应用对手势事件的订阅"""
+        for app in (self.drawing_app, self.game_app, self.vr_app, self.vr_pvp_app):
+            if app is not None:
+                self.gesture_events.disconnect(app)
+
     def _cleanup_apps(self):
         """清理所有应用实例，释放资源"""
+        self._disconnect_app_events()
         if self.drawing_app:
             self.stack.removeWidget(self.drawing_app)
             self.drawing_app.deleteLater()
@@ -307,6 +687,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def _start_drawing(self):
         self._cleanup_apps()
         self.drawing_app = DrawingBoard()
+        self.drawing_app.connect_events(self.gesture_events)
         self.stack.addWidget(self.drawing_app)
         self.stack.setCurrentWidget(self.drawing_app)
         self.current_mode = "drawing"
@@ -314,6 +695,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def _start_game(self):
         self._cleanup_apps()
         self.game_app = PaddleGame()
+        self.game_app.hand_source = self._game_hand_source
         self.stack.addWidget(self.game_app)
         self.stack.setCurrentWidget(self.game_app)
         self.current_mode = "game"
@@ -325,6 +707,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def _start_vr(self):
         self._cleanup_apps()
         self.vr_app = VRMode(parent=self)
+        self.vr_app.hand_source = self._vr_hand_source
         self.stack.addWidget(self.vr_app)
         self.stack.setCurrentWidget(self.vr_app)
         self.current_mode = "vr"
@@ -332,6 +715,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def _start_vr_pvp(self):
         self._cleanup_apps()
         self.vr_pvp_app = VRPVPMode(parent=self)
+        self.vr_pvp_app.hand_source = self._vr_pvp_hand_source
         self.stack.addWidget(self.vr_pvp_app)
         self.stack.setCurrentWidget(self.vr_pvp_app)
         self.current_mode = "vr_pvp"
@@ -339,70 +723,117 @@ class MainWindow(QtWidgets.QMainWindow):
     @pyqtSlot()
     def _return_to_menu(self):
         """返回主菜单，清理当前应用"""
+        self._disconnect_app_events()
         self.current_mode = "menu"
         self.stack.setCurrentWidget(self.menu_widget)
-        QtCore.QTimer.singleShot(500, self._cleanup_apps)
+        QtCore.QTimer.singleShot(500, self._deferred_cleanup)
+
+    def _deferred_cleanup(self):
+        """返回主菜单后的延迟清理；期间已进入新应用时跳过（新应用启动时已清理过旧应用），
+        否则会把刚启动的应用从界面栈中移除"""
+        if self.current_mode == "menu":
+            self._cleanup_apps()
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_M:
+            self._toggle_metrics()
+        elif event.key() == QtCore.Qt.Key_T:
+            self._dump_trace()
+        else:
+            super().keyPressEvent(event)
+
+    def _toggle_metrics(self):
+        METRICS.enabled = not METRICS.enabled
+        if not METRICS.enabled:
+            self.cam_label.metrics_lines = None
+            self.cam_label.flush_updates()
+        print(f"耗时统计已{'开启' if METRICS.enabled else '关闭'}")
+
+    def _dump_trace(self):
+        """把最近一段时间的帧时间线导出为 Chrome trace JSON（可在 Perfetto 中打开）"""
+        if not TRACER.enabled:
+            print("帧追踪未开启（启动时加 --trace）")
+            return
+        path = os.path.join(self.trace_dir, time.strftime('trace_%Y%m%d_%H%M%S.json'))
+        try:
+            count = TRACER.dump(path)
+            print(f"已导出最近 {TRACER.window_s:.0f} 秒的帧时间线（{count} 个事件）: {path}")
+        except OSError as e:
+            print(f"导出帧时间线失败: {e}")
+
+    def _export_metrics(self):
+        if self.metrics_export and METRICS.enabled:
+            try:
+                METRICS.export(self.metrics_export)
+            except OSError as e:
+                print(f"导出耗时统计失败: {e}")
+
+    def _watchdog_context(self):
+        """看门狗记录卡顿时附带的上下文（在看门狗线程中调用，只读取简单字段）"""
+        latest = self.capture.latest()
+        capture_age = f"{(time.monotonic() - latest.timestamp) * 1000:.0f}ms" if latest else "尚无帧"
+        started = self._update_started
+        last_update = self._last_update_ms
+        return {
+            'mode': self.current_mode,
+            'in_update': f"{(time.perf_counter() - started) * 1000:.0f}ms" if started is not None else "否",
+            'last_update_duration': f"{last_update:.1f}ms" if last_update is not None else "-",
+            'last_displayed_seq': self._last_seq,
+            'last_captured_seq': latest.seq if latest else 0,
+            'last_capture_age': capture_age,
+            'pipeline': self.pipeline.stats(),
+        }
+
+    def _drop_packet(self, packet, counter):
+        """流水线丢弃或覆盖的帧：计数并归还缓冲区"""
+        METRICS.count(counter)
+        packet.release()
 
     # 绘制手部关键点和连接线（使用官方21点连线）
+    # frame 为共享的RGB帧；渲染阶段时推理和识别都已读取完毕，直接在其上原地绘制
+    @timed('draw_landmarks')
     def _draw_hand_landmarks(self, frame, hands):
         # 仅在主页面使用官方连线
         if self.current_mode == "menu":
-            # 转换为RGB用于MediaPipe绘制
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # 创建一个空白图像用于绘制手部关键点
-            annotated_image = frame.copy()
+            annotated_image = frame
             
+            h, w, _ = frame.shape
             for hand in hands:
-                # 将手部关键点转换为MediaPipe格式
-                landmarks = hand['landmarks']
+                # 将手部关键点转换为MediaPipe格式（整只手一次归一化）
+                normalized = (hand.points / (w, h, 1)).tolist()
                 mp_landmarks = landmark_pb2.NormalizedLandmarkList()
-                for x, y, z in landmarks:
-                    # 归一化坐标
-                    h, w, _ = frame.shape
-                    norm_x = x / w
-                    norm_y = y / h
-                    mp_landmarks.landmark.add(x=norm_x, y=norm_y, z=z)
+                for x, y, z in normalized:
+                    mp_landmarks.landmark.add(x=x, y=y, z=z)
                 
                 # 使用MediaPipe的官方绘制方法
                 solutions.drawing_utils.draw_landmarks(
                     annotated_image,
                     mp_landmarks,
                     mp_hands.HAND_CONNECTIONS,
-                    solutions.drawing_styles.get_default_hand_landmarks_style(),
-                    solutions.drawing_styles.get_default_hand_connections_style()
+                    self._landmark_style,
+                    self._connection_style
                 )
             
             return annotated_image
         else:
             # 在其他页面使用原有绘制方式
             for hand in hands:
-                landmarks = hand['landmarks']
-                
-                # 绘制连接线
-                for (start, end) in [
-                    (0, 1), (1, 2), (2, 3), (3, 4),  # 拇指
-                    (0, 5), (5, 6), (6, 7), (7, 8),  # 食指
-                    (0, 9), (9, 10), (10, 11), (11, 12),  # 中指
-                    (0, 13), (13, 14), (14, 15), (15, 16),  # 无名指
-                    (0, 17), (17, 18), (18, 19), (19, 20)   # 小指
-                ]:
-                    x1, y1, _ = landmarks[start]
-                    x2, y2, _ = landmarks[end]
-                    cv2.line(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                    
-                # 绘制所有21个关键点
-                for (x, y, _) in landmarks:
-                    cv2.circle(frame, (x, y), 5, (0, 0, 255), -1)
+                points = hand.xy.astype(np.int32)
+
+                # 绘制连接线：每根手指从手腕出发的一条折线
+                cv2.polylines(frame, [points[chain] for chain in FINGER_CHAINS], False, (0, 255, 0), 2)
+
+                # 绘制所有21个关键点（RGB红色）
+                for (x, y) in points.tolist():
+                    cv2.circle(frame, (x, y), 5, (255, 0, 0), -1)
             
             return frame
 
     # 获取手势信息用于显示
-    def _get_gesture_info(self, hands):
+    def _get_gesture_info(self, hands, gestures):
         gesture_info = []
-        for hand in hands:
-            # 使用GestureLogic获取手势（保持原有逻辑不变）
-            gesture = self.glogic.get_hand_gesture(hand) or "unknown"
+        for hand, gesture in zip(hands, gestures):
+            gesture = gesture or "unknown"
             
             if gesture and gesture != "unknown":
                 # 使用手腕位置作为手势标签位置
@@ -413,62 +844,163 @@ class MainWindow(QtWidgets.QMainWindow):
                 gesture_info.append((display_x, display_y, gesture))
         return gesture_info
 
+    # 流水线阶段（运行在工作线程中）
+    @timed('stage_inference')
+    def _stage_inference(self, packet):
+        """推理阶段：MediaPipe手部关键点，主菜单下额外运行官方手势模型"""
+        use_recognizer = True
+        if self.governor:
+            # 质量调节跳帧：不推理，手势阶段沿用上一帧的结果，画面仍然正常刷新
+            if self.governor.should_skip(packet.seq):
+                METRICS.count('skipped_frames')
+                packet.skipped = True
+                return packet
+            use_recognizer = self.governor.level['use_recognizer']
+
+        if self.current_mode == "menu" and self.recognizer_tracker and use_recognizer:
+            # 单次推理：一次模型调用同时得到关键点和官方手势
+            with TRACER.span('recognizer', packet.seq):
+                packet.hands, packet.official_gestures = self.recognizer_tracker.recognize_rgb(
+                    packet.frame, packet.timestamp * 1000)
+        else:
+            with TRACER.span('inference', packet.seq):
+                _, packet.hands = self.tracker.process_rgb(packet.frame)
+            if self.current_mode == "menu" and use_recognizer:
+                with TRACER.span('recognizer', packet.seq):
+                    self._process_frame_with_recognizer(packet.frame, packet.timestamp * 1000)
+        if self.recorder:
+            h, w = packet.frame.shape[:2]
+            self.recorder.write(packet.timestamp, packet.seq, packet.hands, (w, h))
+        return packet
+
+    def _apply_quality_level(self, old_level, new_level):
+        """质量档位变化时更新推理配置（模型重建在推理线程中完成）"""
+        self.inference_size = new_level['inference_size']
+        self.tracker.inference_size = new_level['inference_size']
+        self.tracker.set_model_complexity(new_level['model_complexity'])
+        if self.recognizer_tracker:
+            self.recognizer_tracker.inference_size = new_level['inference_size']
+
+    @timed('stage_gesture')
+    def _stage_gesture(self, packet):
+        """手势阶段：关联跨帧的手部轨迹，主菜单下用GestureLogic识别手势"""
+        if packet.skipped:
+            # 跳帧没有新的观测：不更新轨迹、滤波器和关键点时间序列（否则旧位置会带着新时间戳
+            # 被当作新样本，造成阶梯状轨迹、错误的外推和预测置信度下降），只重新发布上一帧的结果
+            packet.hands, packet.tracks, packet.hand_gestures, packet.gestures = self._last_gesture_result
+            return packet
+        packet.tracks = self.hand_tracks.update(packet.hands, packet.timestamp)
+        if self.smoother:
+            # 之后的手势识别、绘制和光标都使用平滑后的关键点（录制文件保存的仍是原始关键点）
+            packet.hands = self.smoother.apply(packet.hands, packet.tracks, packet.timestamp)
+        self.landmark_timeline.add_hands(packet.hands, packet.timestamp)
+        # 所有手的关节角、关键距离一次算出并缓存在 Hand 上，之后的捏合判断直接查表
+        self.glogic.prepare(packet.hands)
+        if self.current_mode == "menu":
+            with TRACER.span('gesture', packet.seq):
+                # 使用GestureLogic获取手势，每只手使用各自轨迹上的稳定性投票
+                packet.hand_gestures = [self.glogic.get_hand_gesture(hand, track.votes)
+                                        for hand, track in zip(packet.hands, packet.tracks)]
+                packet.gestures = self._get_gesture_info(packet.hands, packet.hand_gestures)
+        self._last_gesture_result = (packet.hands, packet.tracks, packet.hand_gestures, packet.gestures)
+        return packet
+
+    @pyqtSlot(int)
+    def _on_frame_ready(self, seq):
+        # 排队中的旧信号直接忽略，只处理最新一帧
+        if seq <= self._last_seq:
+            return
+        self._update()
+
+    @timed('update')
     def _update(self):
-        ret, frame = self.cap.read()
-        if not ret:
+        """渲染阶段（GUI线程）：取流水线最新结果，绘制并分发给当前应用"""
+        packet = self.publisher.latest()
+        if packet is None or packet.seq <= self._last_seq:
             return
-        frame = cv2.flip(frame, 1)
-        annotated, hands = self.tracker.process(frame)
-        
+        self._last_seq = packet.seq
+        # 记录本次 _update 的耗时，看门狗报告卡顿时可区分是卡在帧处理内还是其他地方
+        self._update_started = time.perf_counter()
+        try:
+            self._show_packet(packet)
+        finally:
+            self._last_update_ms = (time.perf_counter() - self._update_started) * 1000
+            self._update_started = None
+
+    def _show_packet(self, packet):
+        self._render(packet)
+
+        # 新帧已显示并交给应用，上一帧的缓冲区可以归还
+        if self._displayed_packet is not None:
+            self._displayed_packet.release()
+        self._displayed_packet = packet
+
+        if self.governor:
+            # 采集时间戳到界面处理完成的端到端耗时
+            self.governor.record((time.monotonic() - packet.timestamp) * 1000)
+            self.cam_label.status_text = self.governor.describe()
+
+        if METRICS.enabled:
+            METRICS.record('latency', (time.monotonic() - packet.timestamp) * 1000)
+            # 叠加层每 0.5 秒刷新一次，避免每帧计算分位数
+            now = time.monotonic()
+            if now - self._metrics_hud_time > 0.5:
+                self._metrics_hud_time = now
+                self.cam_label.metrics_lines = METRICS.hud_lines()
+
+        if self.cursor_predictor:
+            self.cursor_predictor.observe_latency(time.monotonic() - packet.timestamp)
+
+        # 本帧对界面的所有修改合并为一次重绘
+        self.cam_label.flush_updates()
+
+    @timed('render')
+    @traced('render')
+    def _render(self, packet):
+        frame = packet.frame
+        hands = packet.hands
+        # 本帧的派生数据（主控制手、食指尖、捏合、坐标换算）只算一次，所有使用者共享
+        ctx = self.frame_context = FrameContext(packet, self.glogic)
+
         # 绘制手掌连线和关键点（根据当前模式使用不同绘制方式）
-        annotated = self._draw_hand_landmarks(annotated, hands)
+        with TRACER.span('draw', packet.seq):
+            annotated = self._draw_hand_landmarks(frame, hands)
 
         if self.current_mode == "menu":
-            # 转换为RGB用于显示和模型处理
-            frame_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
-            h, w, _ = frame_rgb.shape
-            
-            # 仅在主页面使用官方模型识别手势
-            official_gestures = self._process_frame_with_recognizer(frame_rgb)
-            
-            # 转换为QPixmap显示
-            qt_img = QtGui.QImage(frame_rgb.data, w, h, QtGui.QImage.Format_RGB888)
-            pix = QtGui.QPixmap.fromImage(qt_img).scaled(self.cam_label.size(),
-                                                         QtCore.Qt.KeepAspectRatioByExpanding)
-            self.cam_label.setPixmap(pix)
+            # 单次推理模式下结果随帧同步给出，否则取异步识别最新完成的结果
+            if self.recognizer_tracker:
+                official_gestures = packet.official_gestures
+            elif self.gesture_recognizer:
+                official_gestures = self.gesture_recognizer.latest()
+            else:
+                official_gestures = []
+
+            # 直接显示共享的RGB帧（零拷贝）
+            self.cam_label.set_frame(annotated)
 
             # 更新原有手势信息显示
-            gesture_info = self._get_gesture_info(hands)
+            map_start = TRACER.begin()
+            gesture_info = packet.gestures
             # 坐标映射到UI尺寸
-            mapped_gestures = []
-            scale_x = self.cam_label.width() / w
-            scale_y = self.cam_label.height() / h
-            for (x, y, gesture) in gesture_info:
-                mapped_x = int(x * scale_x)
-                mapped_y = int(y * scale_y)
-                mapped_gestures.append((mapped_x, mapped_y, gesture))
+            label = self.cam_label
+            mapped_gestures = [ctx.to_widget((x, y), label) + (gesture,) for (x, y, gesture) in gesture_info]
             self.cam_label.set_hand_gestures(mapped_gestures)
 
             # 处理官方模型识别的手势并显示
-            mapped_official = []
-            for (x, y, gesture) in official_gestures:
-                mapped_x = int(x * scale_x)
-                mapped_y = int(y * scale_y)
-                mapped_official.append((mapped_x, mapped_y, gesture))
+            mapped_official = [ctx.to_widget((x, y), label) + (gesture,) for (x, y, gesture) in official_gestures]
             self.cam_label.set_official_gestures(mapped_official)
 
             # 手指位置处理
-            index_tip = self.glogic.extract_index_tip(hands)
-            if index_tip is not None:
-                scale_x = self.cam_label.width() / w
-                scale_y = self.cam_label.height() / h
-                x_mapped = int(index_tip[0] * scale_x)
-                y_mapped = int(index_tip[1] * scale_y)
-                self.cam_label.cursor_pos = (x_mapped, y_mapped)
-            else:
-                self.cam_label.cursor_pos = None
+            self.cam_label.cursor_pos = ctx.to_widget(ctx.index_tip, label)
+
+            TRACER.end('mapping', map_start, packet.seq)
 
-            # 悬停检测
+            # 主菜单下也跟踪捏合和手势变化，进入应用时仍在捏合的手不会被当作新的捏合
+            self.gesture_event_tracker.update(hands, ctx.pinches, packet.hand_gestures, timestamp=packet.timestamp)
+            self.gesture_events.flush()
+
+            # 悬停检测：停留计时保存在光标手（主控制手）自己的轨迹上，
+            # 换手时新光标手从头计时，其他手的停留状态清零
             hover_name = None
             if self.cam_label.cursor_pos is not None:
                 cursor_pt = QtCore.QPoint(*self.cam_label.cursor_pos)
@@ -477,93 +1009,97 @@ class MainWindow(QtWidgets.QMainWindow):
                         hover_name = name
                         break
 
-            if hover_name != self.last_hover_name:
-                self.last_hover_name = hover_name
-                self.hover_start_time = QtCore.QTime.currentTime()
+            dwell = None
+            for hand, track in zip(hands, packet.tracks):
+                if hand is ctx.primary:
+                    dwell = track.dwell
+                else:
+                    track.dwell.reset()
+
+            if dwell is not None and hover_name != dwell.target:
+                dwell.target = hover_name
+                dwell.start = time.monotonic()
 
-            if hover_name:
-                elapsed = self.hover_start_time.msecsTo(QtCore.QTime.currentTime()) / 1000
+            if hover_name and dwell is not None:
+                elapsed = time.monotonic() - dwell.start
                 progress = min(1.0, elapsed / self.glogic.dwell_time)
                 self.cam_label.hover_button = hover_name
                 self.cam_label.hover_progress = progress
                 if progress >= 1.0:
+                    # 触发后重新计时，光标停在同一按钮上不会每帧重复触发
+                    dwell.reset()
                     self._trigger_button(hover_name)
             else:
                 self.cam_label.hover_button = None
                 self.cam_label.hover_progress = 0.0
 
-            self.cam_label.update()
-
         else:
             # 优先右手作为主控制手
-            primary = next((h for h in hands if h['handedness'] == 'Right'), hands[0] if hands else None)
-            
-            # 保留pinch手势功能 - 返回主菜单
-            if primary and self.glogic.is_pinch(primary) and self.current_mode not in ["drawing", "vr_pvp"]:
-                self._return_to_menu()
-                return
+            primary = ctx.primary
+            # 记录各角色对应的轨迹，应用按节拍从关键点时间序列中查询其位置
+            self._hand_roles = ctx.roles
 
             # 更新应用
-            index_tip = self.glogic.extract_index_tip(hands)
-            target_pos = None
-            if index_tip is not None:
-                frame_h, frame_w = frame.shape[:2]
-                rel_x = index_tip[0] / frame_w
-                rel_y = index_tip[1] / frame_h
-                app_w = self.stack.currentWidget().width()
-                app_h = self.stack.currentWidget().height()
-                target_pos = (int(rel_x * app_w), int(rel_y * app_h))
-
-            # 判断是否捏合（用于绘图等功能）
-            is_pinch = primary and self.glogic.is_pinch(primary)
-
-            # 根据当前模式更新对应应用
-            if self.current_mode == "drawing" and self.drawing_app:
-                self.drawing_app.update_cursor(target_pos, is_pinch)  # 传递pinch状态
-            elif self.current_mode == "game" and self.game_app:
-                self.game_app.update_cursor(target_pos)
-            elif self.current_mode == "vr" and self.vr_app:
-                if frame is not None:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    self.vr_app.update_camera_frame(frame_rgb.copy())
-                
-                palm_center = None
-                if hands:
-                    primary = next((h for h in hands if h['handedness'] == 'Right'), hands[0])
-                    if primary:
-                        x, y, _ = primary['landmarks'][0]
-                        frame_h, frame_w = frame.shape[:2]
-                        app_w = self.stack.currentWidget().width()
-                        app_h = self.stack.currentWidget().height()
-                        palm_center = (int(x * app_w / frame_w), int(y * app_h / frame_h))
-                
-                self.vr_app.update_hand_position(palm_center)
-            elif self.current_mode == "vr_pvp" and self.vr_pvp_app:
-                if frame is not None:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    self.vr_pvp_app.update_camera_background(frame_rgb)
-                
-                # 分离左右手控制
-                left_hand = next((h for h in hands if h['handedness'] == 'Left'), None)
-                right_hand = next((h for h in hands if h['handedness'] == 'Right'), None)
-                
-                pos1 = None
-                if left_hand:
-                    x, y, _ = left_hand['landmarks'][0]
-                    frame_h, frame_w = frame.shape[:2]
-                    app_w = self.stack.currentWidget().width()
-                    app_h = self.stack.currentWidget().height()
-                    pos1 = (int(x * app_w / frame_w), int(y * app_h / frame_h))
-                
-                pos2 = None
-                if right_hand:
-                    x, y, _ = right_hand['landmarks'][0]
-                    frame_h, frame_w = frame.shape[:2]
-                    app_w = self.stack.currentWidget().width()
-                    app_h = self.stack.currentWidget().height()
-                    pos2 = (int(x * app_w / frame_w), int(y * app_h / frame_h))
-                
-                self.vr_pvp_app.update_hand_positions(pos1, pos2)
+            update_start = TRACER.begin()
+            app = self.stack.currentWidget()
+            index_tip = ctx.index_tip
+            if index_tip is not None and self.cursor_predictor and primary.track_id is not None:
+                # 画笔落点按预计显示时刻预测，与手的实际位置对齐
+                predicted = self.cursor_predictor.predict(
+                    primary.track_id, 8, self.cursor_predictor.display_time(packet.timestamp))
+                if predicted is not None:
+                    index_tip = predicted
+            target_pos = ctx.to_widget(index_tip, app)
+
+            # 光标移动和捏合通过手势事件通知应用（画板订阅）；
+            # 挡板球和VR模式的手部位置由应用在自己的节拍中通过 hand_source 查询
+            cursor = (primary.track_id, target_pos) if target_pos is not None else None
+            self.gesture_event_tracker.update(hands, ctx.pinches, cursor=cursor, timestamp=packet.timestamp)
+            self.gesture_events.flush()
+
+            # 把本帧上下文交给当前应用（VR模式取其中的摄像头帧作为背景）；捏合可能已切回主菜单
+            if self.current_mode != "menu":
+                self.stack.currentWidget().set_frame_context(ctx)
+            TRACER.end('app_update', update_start, packet.seq)
+
+    def _on_track_expired(self, track_id):
+        """轨迹超时移除（流水线手势阶段中调用）：清理光标预测中该手的状态"""
+        if self.cursor_predictor:
+            self.cursor_predictor.forget(track_id)
+
+    def _on_pinch_start(self, event):
+        """保留pinch手势功能：主控制手捏合返回主菜单（画板和VR对战中捏合另有用途）"""
+        if event.track_id != self._hand_roles.get('primary'):
+            return
+        if self.current_mode not in ["menu", "drawing", "vr_pvp"]:
+            self._return_to_menu()
+
+    def _timeline_position(self, role, landmark, widget):
+        """查询某只手的关键点在当前时刻的位置（插值/外推，开启预测时做延迟补偿），换算为 widget 坐标；没有时返回 None"""
+        track_id = self._hand_roles.get(role)
+        ctx = self.frame_context
+        if track_id is None or widget is None or ctx is None:
+            return None
+        t = time.monotonic() - self.timeline_delay
+        if self.cursor_predictor:
+            point = self.cursor_predictor.predict(track_id, landmark, t)
+        else:
+            point = self.landmark_timeline.query(track_id, t, landmark)
+        # 与本帧其他坐标使用同一套帧 -> widget 换算
+        return ctx.to_widget(point, widget)
+
+    def _game_hand_source(self):
+        """挡板球：主控制手的食指尖(8)"""
+        return self._timeline_position('primary', 8, self.game_app)
+
+    def _vr_hand_source(self):
+        """VR模式：主控制手的手腕(0)"""
+        return self._timeline_position('primary', 0, self.vr_app)
+
+    def _vr_pvp_hand_source(self):
+        """VR对战：左手、右手的手腕(0)分别控制两名玩家"""
+        return (self._timeline_position('Left', 0, self.vr_pvp_app),
+                self._timeline_position('Right', 0, self.vr_pvp_app))
 
     def _trigger_button(self, name):
         if name in self.button_actions:
@@ -573,10 +1109,53 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _clear_click_flash(self):
         self.cam_label.clicked_button = None
+        self.cam_label.flush_updates()
 
 
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
-    win = MainWindow()
+    parser = add_source_arguments(argparse.ArgumentParser(description="AirCtrl 手势交互"))
+    parser.add_argument('--record', metavar='PATH', help='把每帧的手部关键点录制到二进制文件')
+    parser.add_argument('--replay', metavar='PATH', help='回放录制的关键点文件，代替 MediaPipe 推理')
+    parser.add_argument('--metrics', action='store_true', help='启动时打开各阶段耗时统计（运行中按 M 键切换）')
+    parser.add_argument('--metrics-export', metavar='PATH',
+                        help='定期把耗时统计写入文件：.json 为 JSON，其他扩展名为 Prometheus 文本格式')
+    parser.add_argument('--metrics-interval', type=float, default=10.0, help='统计导出间隔（秒，默认 10）')
+    parser.add_argument('--trace', action='store_true',
+                        help='记录帧时间线，运行中按 T 键导出最近一段时间的 Chrome trace JSON')
+    parser.add_argument('--trace-dir', default='traces', help='帧时间线导出目录（默认 traces）')
+    parser.add_argument('--trace-seconds', type=float, default=10.0, help='每次导出的时间长度（秒，默认 10）')
+    parser.add_argument('--watchdog-ms', type=int, default=1000,
+                        help='界面卡顿超过该时长时记录主线程调用栈，0 表示关闭（默认 1000）')
+    parser.add_argument('--watchdog-log', default='logs/stall.log', help='卡顿日志路径（默认 logs/stall.log）')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help='回放速度倍率，0 表示不按时间轴、逐帧回放（默认 1.0）')
+    parser.add_argument('--no-smoothing', action='store_true', help='关闭关键点 One Euro 平滑')
+    parser.add_argument('--smooth-min-cutoff', type=float, default=1.0,
+                        help='平滑的静止截止频率（Hz，越小越稳，默认 1.0）')
+    parser.add_argument('--smooth-beta', type=float, default=0.01,
+                        help='平滑的速度系数（越大快速移动越跟手，默认 0.01）')
+    parser.add_argument('--timeline-horizon-ms', type=float, default=100,
+                        help='游戏节拍查询手部位置时最多向后外推的时长（毫秒，默认 100）')
+    parser.add_argument('--timeline-delay-ms', type=float, default=0,
+                        help='游戏节拍查询的时刻比当前早多少毫秒，>0 时以插值为主（默认 0）')
+    parser.add_argument('--no-prediction', action='store_true', help='关闭光标的延迟补偿预测')
+    parser.add_argument('--inference-size', type=parse_size, default=(640, 360), metavar='WxH',
+                        help='推理分辨率上限，开启质量调节时为最高档的分辨率（默认 640x360）')
+    parser.add_argument('--latency-budget-ms', type=float, default=50,
+                        help='端到端延迟预算，超出时自动降低推理质量；0 表示关闭质量调节（默认 50）')
+    args, qt_args = parser.parse_known_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    win = MainWindow(source=args.source, realtime=not args.fast,
+                     record_path=args.record, replay_path=args.replay,
+                     replay_speed=args.replay_speed, metrics_enabled=args.metrics,
+                     metrics_export=args.metrics_export, metrics_interval=args.metrics_interval,
+                     trace=args.trace, trace_dir=args.trace_dir, trace_seconds=args.trace_seconds,
+                     watchdog_ms=args.watchdog_ms, watchdog_log=args.watchdog_log,
+                     smoothing=not args.no_smoothing, smooth_min_cutoff=args.smooth_min_cutoff,
+                     smooth_beta=args.smooth_beta, timeline_horizon_ms=args.timeline_horizon_ms,
+                     timeline_delay_ms=args.timeline_delay_ms, cursor_prediction=not args.no_prediction,
+                     inference_size=args.inference_size,
+                     latency_budget_ms=args.latency_budget_ms or None)
     win.show()
     sys.exit(app.exec_())
\ No newline at end of file
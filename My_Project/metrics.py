@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+class _NullTimer:
+    """关闭统计时使用的空计时器，进入/退出不做任何事"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.add((time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class RollingHistogram:
+    """
+    滚动窗口耗时统计：只保留最近 size 个样本（环形缓冲区），分位数按需计算；
+    另外累计全部样本的总数和总耗时（Prometheus summary 的 _count / _sum）
+    """
+    def __init__(self, size=300):
+        self._values = np.zeros(size, dtype=np.float64)
+        self._index = 0
+        self._filled = 0
+        self._lock = threading.Lock()
+        self.total_count = 0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        with self._lock:
+            self._values[self._index] = ms
+            self._index = (self._index + 1) % len(self._values)
+            if self._filled < len(self._values):
+                self._filled += 1
+            self.total_count += 1
+            self.total_ms += ms
+
+    def summary(self):
+        with self._lock:
+            values = self._values[:self._filled].copy()
+            total_count, total_ms = self.total_count, self.total_ms
+        if not len(values):
+            return None
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            'count': total_count,
+            'sum_ms': total_ms,
+            'mean_ms': float(values.mean()),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(values.max()),
+        }
+
+
+class Metrics:
+    """
+    热路径耗时统计：
+        with METRICS.timer('inference'):
+            ...
+        METRICS.count('dropped_frames')
+    enabled=False 时 timer() 返回共享的空计时器、count() 直接返回，几乎没有开销；
+    运行中可随时切换 enabled。
+    export() 把当前统计写成 Prometheus 文本格式（.prom）或 JSON，供监控程序采集。
+    """
+    def __init__(self, enabled=False, window=300):
+        self.enabled = enabled
+        self.window = window
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, name):
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, RollingHistogram(self.window))
+        return hist
+
+    def timer(self, name):
+        """返回计时上下文管理器，退出时把耗时记入 name 阶段"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self._histogram(name))
+
+    def record(self, name, ms):
+        """直接记录一个耗时样本（毫秒），如采集到显示的端到端延迟"""
+        if self.enabled:
+            self._histogram(name).add(ms)
+
+    def count(self, name, n=1):
+        """累加计数器，如丢帧数"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+
+    def snapshot(self):
+        """返回 {'stages': {阶段: 统计}, 'counters': {名称: 计数}}"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        stages = {}
+        for name, hist in histograms.items():
+            summary = hist.summary()
+            if summary:
+                stages[name] = summary
+        return {'stages': stages, 'counters': counters}
+
+    def hud_lines(self):
+        """供界面叠加显示的文本行"""
+        snap = self.snapshot()
+        lines = [f"{name:<16} p50 {s['p50_ms']:6.1f}  p95 {s['p95_ms']:6.1f}  p99 {s['p99_ms']:6.1f} ms"
+                 for name, s in sorted(snap['stages'].items())]
+        lines += [f"{name:<16} {value}" for name, value in sorted(snap['counters'].items())]
+        return lines
+
+    def to_prometheus(self, prefix='airctrl'):
+        snap = self.snapshot()
+        out = [f"# HELP {prefix}_stage_latency_ms 各阶段耗时（毫秒，分位数基于最近 {self.window} 个样本）",
+               f"# TYPE {prefix}_stage_latency_ms summary"]
+        for name, s in sorted(snap['stages'].items()):
+            for q, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                out.append(f'{prefix}_stage_latency_ms{{stage="{name}",quantile="{q}"}} {s[key]:.3f}')
+            out.append(f'{prefix}_stage_latency_ms_sum{{stage="{name}"}} {s["sum_ms"]:.3f}')
+            out.append(f'{prefix}_stage_latency_ms_count{{stage="{name}"}} {s["count"]}')
+        out.append(f"# HELP {prefix}_events_total 事件计数（丢帧等）")
+        out.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in sorted(snap['counters'].items()):
+            out.append(f'{prefix}_events_total{{name="{name}"}} {value}')
+        return '\n'.join(out) + '\n'
+
+    def to_json(self):
+        snap = self.snapshot()
+        snap['timestamp'] = time.time()
+        return json.dumps(snap, indent=2, ensure_ascii=False)
+
+    def export(self, path):
+        """按扩展名写出 JSON（.json）或 Prometheus 文本格式（其他），先写临时文件再替换，避免采集到半个文件"""
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+# 全局统计实例，各模块直接导入使用（默认关闭）
+METRICS = Metrics()
+
+
+def timed(name):
+    """方法装饰器：METRICS 打开时统计每次调用的耗时，关闭时只多一次属性判断"""
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            with METRICS.timer(name):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
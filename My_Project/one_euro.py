@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+
+from hand import Hand
+
+
+def _alpha(dt, cutoff):
+    """截止频率 cutoff（Hz）对应的一阶低通平滑系数，cutoff 可以是数组"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One Euro 滤波器（速度自适应低通）：静止时截止频率低、抖动被压住，
+    移动越快截止频率越高、几乎不增加延迟。
+      min_cutoff: 静止时的截止频率（Hz），越小越平滑
+      beta: 截止频率随速度增加的系数，越大快速移动时越跟手
+      d_cutoff: 速度估计的截止频率（Hz）
+    输入可以是任意形状的数组（如一只手的 (21, 3) 关键点），每个分量独立滤波，一次 NumPy 运算完成。
+    """
+    __slots__ = ('min_cutoff', 'beta', 'd_cutoff', 'x_prev', 'dx_prev', 't_prev')
+
+    def __init__(self, min_cutoff=1.0, beta=0.01, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = None
+
+    def __call__(self, x, timestamp):
+        """输入 timestamp 秒时刻的观测 x，返回滤波后的数组（float64）"""
+        x = np.asarray(x, dtype=np.float64)
+        if self.x_prev is None:
+            self.x_prev = x.copy()
+            self.dx_prev = np.zeros_like(x)
+            self.t_prev = timestamp
+            return self.x_prev
+        dt = timestamp - self.t_prev
+        if dt <= 0:
+            # 时间戳不递增的观测不更新状态（跳帧的包在手势阶段已被跳过，不会送到这里）
+            return self.x_prev
+
+        dx = (x - self.x_prev) / dt
+        dx_hat = self.dx_prev + _alpha(dt, self.d_cutoff) * (dx - self.dx_prev)
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        x_hat = self.x_prev + _alpha(dt, cutoff) * (x - self.x_prev)
+
+        self.x_prev = x_hat
+        self.dx_prev = dx_hat
+        self.t_prev = timestamp
+        return x_hat
+
+
+class LandmarkSmoother:
+    """
+    对每只被跟踪的手的全部 21 个关键点做 One Euro 滤波，滤波器状态保存在 HandTrack.filter 上，
+    两只手互不影响；轨迹过期重建时滤波器随之重置。
+    坐标单位为像素，beta 的量级按像素/秒的速度选取。
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.01, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+    def set_params(self, min_cutoff=None, beta=None):
+        """运行中调整参数，已有轨迹的滤波器同步生效"""
+        if min_cutoff is not None:
+            self.min_cutoff = min_cutoff
+        if beta is not None:
+            self.beta = beta
+
+    def apply(self, hands, tracks, timestamp):
+        """返回平滑后的 Hand 列表（与 hands 一一对应），原始 hands 不被修改"""
+        smoothed = []
+        for hand, track in zip(hands, tracks):
+            f = track.filter
+            if f is None:
+                f = track.filter = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff)
+            else:
+                f.min_cutoff = self.min_cutoff
+                f.beta = self.beta
+            points = f(hand.points, timestamp).astype(np.float32)
+            out = Hand(points, hand.handedness, hand.score)
+            out.track_id = hand.track_id
+            smoothed.append(out)
+        return smoothed
@@ -0,0 +1,202 @@
+import threading
+import time
+from collections import deque
+
+from PyQt5 import QtCore
+
+DROP_OLDEST = 'drop_oldest'  # 队列满时丢弃最旧的元素，保证总是处理最新帧
+BLOCK = 'block'              # 队列满时阻塞上游（背压），不丢帧
+
+
+class BoundedQueue:
+    """
+    有界队列，满时按策略处理：
+      - DROP_OLDEST: 丢弃队头最旧元素后入队
+      - BLOCK: 阻塞生产者直到有空位（或超时返回 False）
+    """
+    def __init__(self, maxsize=2, policy=DROP_OLDEST, on_drop=None):
+        if policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"未知的丢帧策略: {policy}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.on_drop = on_drop  # 丢弃元素时的回调
+        self.dropped = 0
+
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item, timeout=None):
+        """入队，成功返回 True；阻塞策略下超时或队列已关闭返回 False"""
+        dropped_item = None
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    dropped_item = self._items.popleft()
+                    self.dropped += 1
+                else:
+                    ok = self._cond.wait_for(
+                        lambda: self._closed or len(self._items) < self.maxsize, timeout)
+                    if not ok or self._closed:
+                        return False
+            self._items.append(item)
+            self._cond.notify_all()
+        if dropped_item is not None and self.on_drop:
+            self.on_drop(dropped_item)
+        return True
+
+    def get(self, timeout=None):
+        """出队，超时或队列关闭且为空时返回 None"""
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self._closed or self._items, timeout)
+            if not ok or not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+class PipelineStage(threading.Thread):
+    """
+    流水线中的一个阶段：从输入队列取元素，调用 func 处理，
+    结果非 None 时放入输出队列（最后一个阶段没有输出队列）
+    """
+    def __init__(self, name, func, in_queue, out_queue=None):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage_name = name
+        self.func = func
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.processed = 0
+        self.busy_time = 0.0  # 累计处理耗时（秒）
+        self._running = True
+
+    def run(self):
+        while self._running:
+            item = self.in_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            start = time.perf_counter()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                print(f"流水线阶段 {self.stage_name} 出错: {e}")
+                # 出错的帧不会再流向下游，立即归还其帧缓冲区
+                release = getattr(item, 'release', None)
+                if release is not None:
+                    release()
+                continue
+            finally:
+                self.busy_time += time.perf_counter() - start
+            self.processed += 1
+            if result is not None and self.out_queue is not None:
+                self.out_queue.put(result)
+
+    def stop(self):
+        self._running = False
+
+
+class FramePipeline:
+    """
+    多阶段帧处理流水线：每个阶段运行在独立工作线程上，阶段之间用有界队列连接。
+    用法：
+        pipeline = FramePipeline()
+        pipeline.add_stage('inference', infer_func)
+        pipeline.add_stage('gesture', gesture_func, policy=BLOCK)
+        pipeline.start()
+        pipeline.submit(packet)   # 通常由采集线程调用
+    每个阶段可单独配置输入队列大小和丢帧策略（DROP_OLDEST / BLOCK 背压）。
+    on_drop: 队列丢弃元素时的回调（如归还帧缓冲区）
+    """
+    def __init__(self, queue_size=2, policy=DROP_OLDEST, on_drop=None):
+        self.queue_size = queue_size
+        self.policy = policy
+        self.on_drop = on_drop
+        self.queues = []
+        self.stages = []
+        self._started = False
+
+    def add_stage(self, name, func, queue_size=None, policy=None):
+        if self._started:
+            raise RuntimeError("流水线启动后不能再添加阶段")
+        queue = BoundedQueue(queue_size or self.queue_size, policy or self.policy, self.on_drop)
+        if self.stages:
+            self.stages[-1].out_queue = queue
+        self.queues.append(queue)
+        self.stages.append(PipelineStage(name, func, queue))
+        return self
+
+    def submit(self, item, timeout=None):
+        """向第一个阶段提交元素"""
+        if not self.queues:
+            raise RuntimeError("流水线没有任何阶段")
+        return self.queues[0].put(item, timeout)
+
+    def start(self):
+        self._started = True
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self):
+        for stage in self.stages:
+            stage.stop()
+        for queue in self.queues:
+            queue.close()
+        if not self._started:
+            return
+        for stage in self.stages:
+            stage.join(timeout=1.0)
+
+    def stats(self):
+        """返回每个阶段的处理帧数、丢帧数、平均耗时（毫秒）和当前队列长度"""
+        result = {}
+        for stage, queue in zip(self.stages, self.queues):
+            avg_ms = stage.busy_time / stage.processed * 1000 if stage.processed else 0.0
+            result[stage.stage_name] = {
+                'processed': stage.processed,
+                'dropped': queue.dropped,
+                'avg_ms': avg_ms,
+                'queued': len(queue),
+            }
+        return result
+
+
+class FramePublisher(QtCore.QObject):
+    """
+    UI 发布阶段：在工作线程中调用 publish()，通过 Qt 信号把结果送回 GUI 线程。
+    与采集线程相同，只保留最新结果，GUI 处理不过来时旧结果直接被覆盖；
+    被覆盖且从未被取走的结果会交给 on_discard 回调（如归还帧缓冲区）。
+    """
+    result_ready = QtCore.pyqtSignal(int)
+
+    def __init__(self, on_discard=None, parent=None):
+        super().__init__(parent)
+        self.on_discard = on_discard
+        self._lock = threading.Lock()
+        self._latest = None
+        self._taken = True
+
+    def publish(self, packet):
+        with self._lock:
+            discarded = None if self._taken else self._latest
+            self._latest = packet
+            self._taken = False
+        if discarded is not None and self.on_discard:
+            self.on_discard(discarded)
+        self.result_ready.emit(packet.seq)
+
+    def latest(self):
+        with self._lock:
+            self._taken = True
+            return self._latest
@@ -0,0 +1,112 @@
+import time
+
+# 质量档位，从高到低排列；帧耗时超出预算时逐级降档，充裕时逐级升档
+QUALITY_LEVELS = [
+    {'name': 'high', 'inference_size': (640, 360), 'model_complexity': 1,
+     'use_recognizer': True, 'frame_skip': 0},
+    {'name': 'medium', 'inference_size': (480, 270), 'model_complexity': 1,
+     'use_recognizer': True, 'frame_skip': 0},
+    {'name': 'low', 'inference_size': (480, 270), 'model_complexity': 0,
+     'use_recognizer': False, 'frame_skip': 0},
+    {'name': 'minimal', 'inference_size': (320, 180), 'model_complexity': 0,
+     'use_recognizer': False, 'frame_skip': 1},
+]
+
+
+def scaled_levels(inference_size, levels=QUALITY_LEVELS):
+    """
+    以 inference_size 作为最高档的推理分辨率，其余各档按默认档位之间的比例同步缩放，
+    使调用方配置的推理分辨率在开启质量调节时仍然生效
+    """
+    base_w, base_h = levels[0]['inference_size']
+    w, h = inference_size
+    scaled = []
+    for level in levels:
+        lw, lh = level['inference_size']
+        size = (max(2, int(round(w * lw / base_w))), max(2, int(round(h * lh / base_h))))
+        scaled.append(dict(level, inference_size=size))
+    return scaled
+
+
+class QualityGovernor:
+    """
+    自适应质量调节器：
+      - record() 记录每帧的流水线耗时（采集时间戳到界面刷新完成），用指数滑动平均平滑
+      - 平均耗时连续 degrade_frames 帧超出预算则降一档；
+        连续 upgrade_frames 帧低于预算的 upgrade_ratio 倍则升一档
+      - 降档快、升档慢，且每次切换后计数清零（滞回），避免在两个档位之间来回振荡
+    当前档位决定推理分辨率、MediaPipe model_complexity、是否运行官方手势模型和跳帧数。
+    """
+    def __init__(self,
+                 budget_ms=50,
+                 levels=None,
+                 smoothing=0.1,
+                 degrade_frames=15,
+                 upgrade_frames=90,
+                 upgrade_ratio=0.6,
+                 on_change=None):
+        self.budget_ms = budget_ms
+        self.levels = levels or QUALITY_LEVELS
+        self.smoothing = smoothing
+        self.degrade_frames = degrade_frames
+        self.upgrade_frames = upgrade_frames
+        self.upgrade_ratio = upgrade_ratio
+        self.on_change = on_change  # 档位变化回调 on_change(old_level, new_level)
+
+        self.level_index = 0
+        self.avg_ms = None
+        self._over = 0
+        self._under = 0
+
+    @property
+    def level(self):
+        return self.levels[self.level_index]
+
+    def record(self, frame_time_ms):
+        """记录一帧耗时，档位发生变化时返回 True"""
+        if self.avg_ms is None:
+            self.avg_ms = frame_time_ms
+        else:
+            self.avg_ms += self.smoothing * (frame_time_ms - self.avg_ms)
+
+        if self.avg_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif self.avg_ms < self.budget_ms * self.upgrade_ratio:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = 0
+            self._under = 0
+
+        if self._over >= self.degrade_frames and self.level_index < len(self.levels) - 1:
+            return self._set_level(self.level_index + 1)
+        if self._under >= self.upgrade_frames and self.level_index > 0:
+            return self._set_level(self.level_index - 1)
+        return False
+
+    def _set_level(self, index):
+        old = self.level
+        self.level_index = index
+        self._over = 0
+        self._under = 0
+        print(f"[质量调节] {time.strftime('%H:%M:%S')} 平均帧耗时 {self.avg_ms:.1f}ms "
+              f"(预算 {self.budget_ms}ms)，档位 {old['name']} -> {self.level['name']}")
+        if self.on_change:
+            self.on_change(old, self.level)
+        return True
+
+    def should_skip(self, seq):
+        """按当前档位的跳帧数判断该帧是否跳过推理"""
+        skip = self.level['frame_skip']
+        return skip > 0 and seq % (skip + 1) != 0
+
+    def describe(self):
+        """供 HUD 显示的当前决策"""
+        level = self.level
+        w, h = level['inference_size']
+        avg = f"{self.avg_ms:.0f}" if self.avg_ms is not None else "-"
+        return (f"质量: {level['name']}  {avg}/{self.budget_ms}ms  推理 {w}x{h}  "
+                f"模型 {level['model_complexity']}  "
+                f"官方模型 {'开' if level['use_recognizer'] else '关'}  "
+                f"跳帧 {level['frame_skip']}")
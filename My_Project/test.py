@@ -1,8 +1,12 @@
+import argparse
 import cv2
 import mediapipe as mp
 import time
 
-cap = cv2.VideoCapture(0)
+from frame_source import open_frame_source, add_source_arguments
+
+args = add_source_arguments(argparse.ArgumentParser()).parse_args()
+cap = open_frame_source(args.source, realtime=not args.fast)
 mpHands = mp.solutions.hands
 hands = mpHands.Hands(
     static_image_mode=False,
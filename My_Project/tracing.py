@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    """关闭追踪时使用的空区间"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'seq', 'start')
+
+    def __init__(self, tracer, name, seq):
+        self.tracer = tracer
+        self.name = name
+        self.seq = seq
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.end(self.name, self.start, self.seq)
+        return False
+
+
+class FrameTracer:
+    """
+    帧时间线追踪：记录各阶段的起止时间（带帧序号和线程），导出为 Chrome trace_event JSON，
+    可直接在 Perfetto / chrome://tracing 中打开，查看单个卡顿帧的详细时间线。
+      - 事件保存在固定容量的环形缓冲区中，长时间运行也不会增长内存
+      - dump() 只导出最近 window_s 秒的事件（卡顿发生后按热键导出"最近10秒"）
+    用法：
+        with TRACER.span('inference', packet.seq):
+            ...
+        start = TRACER.begin()
+        ...
+        TRACER.end('mapping', start, packet.seq)
+    关闭时 span() 返回共享的空区间、begin() 返回 None，几乎没有开销。
+    """
+    def __init__(self, enabled=False, capacity=20000, window_s=10.0):
+        self.enabled = enabled
+        self.window_s = window_s
+        # deque.append 是原子操作，多个线程可以直接写入
+        self._events = deque(maxlen=capacity)
+        self._origin = time.perf_counter()
+
+    def span(self, name, seq=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, seq)
+
+    def begin(self):
+        """开始一个手动区间，返回起始时间（关闭时返回 None）"""
+        return time.perf_counter() if self.enabled else None
+
+    def end(self, name, start, seq=None):
+        """结束手动区间；start 为 begin() 的返回值"""
+        if start is None:
+            return
+        thread = threading.current_thread()
+        self._events.append((name, start, time.perf_counter(), seq, thread.ident, thread.name))
+
+    def clear(self):
+        self._events.clear()
+
+    def events(self, window_s=None):
+        """返回 Chrome trace_event 格式的事件列表（'X' 完整事件 + 线程名元数据）"""
+        window_s = self.window_s if window_s is None else window_s
+        cutoff = time.perf_counter() - window_s if window_s else None
+        pid = os.getpid()
+        out = []
+        threads = {}
+        for name, start, end, seq, tid, thread_name in list(self._events):
+            if cutoff is not None and end < cutoff:
+                continue
+            threads[tid] = thread_name
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'pid': pid,
+                'tid': tid,
+            }
+            if seq is not None:
+                event['args'] = {'seq': seq}
+            out.append(event)
+        for tid, thread_name in threads.items():
+            out.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                        'args': {'name': thread_name}})
+        return out
+
+    def dump(self, path, window_s=None):
+        """把最近 window_s 秒的事件写入 path，返回写入的事件数"""
+        events = self.events(window_s)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+# 全局追踪实例，各模块直接导入使用（默认关闭）
+TRACER = FrameTracer()
+
+
+def traced(name):
+    """方法装饰器：追踪打开时记录每次调用的区间"""
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
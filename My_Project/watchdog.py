@@ -0,0 +1,103 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+
+class StallWatchdog(threading.Thread):
+    """
+    界面卡顿看门狗：GUI 线程中的定时器（间隔约 threshold_ms/4）定期调用 heartbeat()，
+    心跳反映的是事件循环是否仍在运转，而不是是否有新帧到达（摄像头停顿不算卡顿）。
+    看门狗线程发现超过 threshold_ms 没有心跳时，抓取主线程当前的 Python 调用栈
+    （sys._current_frames），连同卡顿时长和 context() 提供的上下文写入滚动日志。
+      - 收到第一次心跳后才开始检测（启动时加载模型不算卡顿）
+      - 每次卡顿只记录一次调用栈；卡顿持续时每隔 threshold_ms 再记录一次，便于看出卡在哪里
+      - 恢复后记录总卡顿时长
+    """
+    def __init__(self,
+                 threshold_ms=1000,
+                 log_path='logs/stall.log',
+                 max_bytes=1024 * 1024,
+                 backup_count=5,
+                 context=None,
+                 check_interval_ms=100):
+        super().__init__(name='stall-watchdog', daemon=True)
+        self.threshold = threshold_ms / 1000
+        self.check_interval = check_interval_ms / 1000
+        self.context = context  # 返回 dict 的回调，补充卡顿时的上下文（如最近帧序号）
+        self.log_path = log_path
+        self.stalls = 0
+
+        self._main_ident = threading.main_thread().ident
+        self._last_beat = None
+        self._stall_start = None
+        self._next_report = 0.0
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.logger = logging.getLogger('airctrl.watchdog')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._handler = RotatingFileHandler(log_path, maxBytes=max_bytes,
+                                            backupCount=backup_count, encoding='utf-8')
+        self._handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        self.logger.addHandler(self._handler)
+
+    def heartbeat(self):
+        """由 GUI 线程的定时器调用，表示事件循环仍在运转"""
+        now = time.monotonic()
+        with self._lock:
+            stall_start = self._stall_start
+            self._stall_start = None
+            self._last_beat = now
+        if stall_start is not None:
+            self.logger.info(f"界面恢复，卡顿共 {(now - stall_start) * 1000:.0f}ms")
+
+    def run(self):
+        while not self._stop_event.wait(self.check_interval):
+            with self._lock:
+                last_beat = self._last_beat
+                if last_beat is None:
+                    continue
+                now = time.monotonic()
+                elapsed = now - last_beat
+                if elapsed < self.threshold:
+                    continue
+                if self._stall_start is None:
+                    self._stall_start = last_beat
+                    self.stalls += 1
+                    self._next_report = now
+                report = now >= self._next_report
+                if report:
+                    self._next_report = now + self.threshold
+            if report:
+                self._report(elapsed)
+
+    def _report(self, elapsed):
+        frame = sys._current_frames().get(self._main_ident)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else '  (无法获取主线程调用栈)\n'
+        lines = [f"界面卡顿: 事件循环已 {elapsed * 1000:.0f}ms 没有响应（阈值 {self.threshold * 1000:.0f}ms），"
+                 f"第 {self.stalls} 次卡顿"]
+        if self.context:
+            try:
+                for key, value in self.context().items():
+                    lines.append(f"  {key}: {value}")
+            except Exception as e:
+                lines.append(f"  (获取上下文失败: {e})")
+        lines.append("主线程调用栈:")
+        lines.append(stack.rstrip())
+        self.logger.warning('\n'.join(lines))
+        print(f"[看门狗] 界面已卡顿 {elapsed * 1000:.0f}ms，调用栈已写入 {self.log_path}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
+        self.logger.removeHandler(self._handler)
+        self._handler.close()